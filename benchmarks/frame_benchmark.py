@@ -0,0 +1,49 @@
+import os
+import sys
+import time
+import argparse
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if base_path not in sys.path:
+    sys.path.append(base_path)
+
+from main import ParticleGenerator
+
+
+def time_frames(editor: ParticleGenerator, frames: int, cache_layers: bool) -> float:
+    editor.cache_layers = cache_layers
+    editor.ui_dirty = True
+    editor.text_cache.clear()
+
+    start = time.perf_counter()
+    for i in range(frames):
+        editor.present(editor.render_frame())
+    return (time.perf_counter() - start) / frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Custo fixo do quadro do editor (fundo + UI)")
+    parser.add_argument("preset", nargs="?", help="Preset da biblioteca (padrão: sistema vazio)")
+    parser.add_argument("--frames", type=int, default=300)
+    args = parser.parse_args()
+
+    editor = ParticleGenerator()
+    for mode in ["particle", "colors", "library"]:
+        editor.edit_mode = mode
+        if args.preset:
+            editor.load_preset(args.preset)
+            editor.create_particle_system()
+
+        legacy = time_frames(editor, args.frames, cache_layers=False)
+        layered = time_frames(editor, args.frames, cache_layers=True)
+        print(f"{mode:<10} sem cache: {legacy * 1000:7.3f} ms/quadro   "
+              f"camadas: {layered * 1000:7.3f} ms/quadro   ({legacy / layered:.1f}x)")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+import os
+import sys
+import argparse
+import tracemalloc
+
+base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+data_path = os.path.join(base_path, "data")
+if data_path not in sys.path:
+    sys.path.append(data_path)
+
+from otps_loader import load_otps_system
+from particle import Particle
+from particle_system import STEP_SIZE
+
+
+class BaselineParticle:
+    # Layout da partícula antes dos __slots__: __dict__ próprio e cópias dos
+    # dados do tipo em cada instância (só para medir, não é desenhada)
+    def __init__(self, position, start_size, final_size, velocity, acceleration, duration,
+                 ignore_physics_after, colors, colors_stops, texture=None, shape=0):
+        self.position = list(position)
+        self.velocity = list(velocity)
+        self.acceleration = list(acceleration)
+        self.start_size = start_size
+        self.final_size = final_size
+        self.size = list(start_size)
+        self.duration = duration
+        self.ignore_physics_after = ignore_physics_after
+        self.colors = colors.copy()
+        self.colors_stops = colors_stops.copy()
+        self.texture = texture
+        self.elapsed_time = 0.0
+        self.finished = False
+        self.color = colors[0] if colors else (255, 255, 255, 255)
+        self.shape = shape
+
+
+def measure(filepath: str, use_pool: bool, seconds: float):
+    particle_system = load_otps_system(filepath, (700, 450), use_pool=use_pool, seed=0)
+
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+
+    # Memória no instante de maior número de partículas vivas
+    peak_count = 0
+    peak_bytes = 0
+    for i in range(int(seconds / STEP_SIZE)):
+        particle_system.step(STEP_SIZE)
+        count = particle_system.get_particle_count()
+        if count > peak_count:
+            peak_count = count
+            peak_bytes = tracemalloc.get_traced_memory()[0] - baseline
+
+    tracemalloc.stop()
+    return peak_count, peak_bytes
+
+
+def measure_objects(filepath: str, seconds: float):
+    # Mesmas partículas do pico no modo lista, recriadas no layout antigo e no atual
+    particle_system = load_otps_system(filepath, (700, 450), use_pool=False, seed=0)
+    peak_step = -1
+    peak_count = 0
+    steps = int(seconds / STEP_SIZE)
+    for i in range(steps):
+        particle_system.step(STEP_SIZE)
+        if particle_system.get_particle_count() > peak_count:
+            peak_count = particle_system.get_particle_count()
+            peak_step = i
+
+    particle_system = load_otps_system(filepath, (700, 450), use_pool=False, seed=0)
+    for i in range(peak_step + 1):
+        particle_system.step(STEP_SIZE)
+    emitter = particle_system.added_emitters[0] if particle_system.added_emitters else None
+    ptype = emitter.particle_type if emitter is not None else None
+    colors = list(ptype.colors) if ptype is not None else []
+    stops = list(ptype.colors_stops) if ptype is not None else []
+
+    live = particle_system.particles
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    old = [
+        BaselineParticle(particle.get_position(), particle.start_size, particle.final_size,
+                         particle.get_velocity(), (particle.ax, particle.ay), particle.duration,
+                         particle.descriptor.ignore_physics_after, colors, stops,
+                         particle.descriptor.texture, particle.descriptor.shape)
+        for particle in live
+    ]
+    old_size = tracemalloc.get_traced_memory()[0] - baseline
+
+    baseline = tracemalloc.get_traced_memory()[0]
+    new = [
+        Particle(particle.descriptor, particle.get_position(), particle.get_velocity(),
+                 (particle.ax, particle.ay), particle.duration, particle.size_multiplier)
+        for particle in live
+    ]
+    new_size = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    return (len(old), old_size), (len(new), new_size)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bytes por partícula viva nos presets")
+    parser.add_argument("presets", nargs="*")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    presets = args.presets
+    if not presets:
+        presets_dir = os.path.join(base_path, "presets")
+        presets = [os.path.join(presets_dir, f) for f in sorted(os.listdir(presets_dir)) if f.endswith('.otps')]
+
+    # antes/depois: só os objetos das partículas do pico, no layout de antes
+    # dos __slots__ e no atual; lista/pool: o sistema inteiro no pico
+    print(f"{'preset':<28} {'modo':<7} {'vivas':>8} {'bytes':>12} {'bytes/partícula':>16}")
+    for filepath in presets:
+        name = os.path.basename(filepath)
+        before, after = measure_objects(filepath, args.seconds)
+        results = [("antes", before), ("depois", after)]
+        results += [("pool" if use_pool else "lista", measure(filepath, use_pool, args.seconds))
+                    for use_pool in (False, True)]
+        for mode, (count, size) in results:
+            per_particle = size / count if count else 0.0
+            print(f"{name:<28} {mode:<7} {count:8d} {size:12d} {per_particle:16.1f}")
+
+
+if __name__ == "__main__":
+    main()
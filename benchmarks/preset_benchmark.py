@@ -0,0 +1,151 @@
+import os
+import sys
+import json
+import time
+import argparse
+
+base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+data_path = os.path.join(base_path, "data")
+if data_path not in sys.path:
+    sys.path.append(data_path)
+
+import pygame
+from otps_loader import load_otps_system
+from particle_system import STEP_SIZE
+
+
+PHASES = ['emission', 'reclaim', 'affectors', 'integration', 'render']
+SURFACE_SIZE = (1400, 900)
+
+
+def run_preset(filepath: str, seconds: float, dt: float, seed: int) -> dict:
+    particle_system = load_otps_system(filepath, (SURFACE_SIZE[0] // 2, SURFACE_SIZE[1] // 2), seed=seed)
+    if particle_system is None:
+        raise ValueError(f"preset inválido: {filepath}")
+
+    surface = pygame.Surface(SURFACE_SIZE)
+    timings = dict.fromkeys(PHASES, 0.0)
+    steps = max(1, int(round(seconds / dt)))
+    particle_steps = 0
+
+    # O próprio step() cronometra emissão, recuperação, affectors e integração
+    particle_system.phase_times = timings
+    clock = time.perf_counter
+    for i in range(steps):
+        particle_system.step(dt)
+
+        surface.fill((0, 0, 0))
+        render_start = clock()
+        particle_system.render(surface)
+        timings['render'] += clock() - render_start
+        particle_steps += particle_system.get_particle_count()
+
+    return {
+        'steps': steps,
+        'particle_steps': particle_steps,
+        'spawned_particles': particle_system.spawned_count,
+        'timings': timings,
+    }
+
+
+def benchmark_preset(filepath: str, seconds: float, dt: float, seed: int, repeat: int) -> dict:
+    # Melhor tempo de cada fase entre as repetições, para reduzir ruído
+    runs = [run_preset(filepath, seconds, dt, seed) for i in range(repeat)]
+    timings = {phase: min(run['timings'][phase] for run in runs) for phase in PHASES}
+    total = sum(timings.values())
+    steps = runs[0]['steps']
+    particle_steps = runs[0]['particle_steps']
+
+    return {
+        'steps': steps,
+        'particle_steps': particle_steps,
+        'spawned_particles': runs[0]['spawned_particles'],
+        'phase_seconds': {phase: round(timings[phase], 6) for phase in PHASES},
+        'steps_per_second': round(steps / total, 2) if total else 0.0,
+        'particles_per_second': round(particle_steps / total, 2) if total else 0.0,
+    }
+
+
+def run_suite(presets: list, seconds: float, dt: float, seed: int, repeat: int) -> dict:
+    results = {}
+    for filepath in presets:
+        results[os.path.basename(filepath)] = benchmark_preset(filepath, seconds, dt, seed, repeat)
+
+    return {
+        'config': {'seconds': seconds, 'dt': dt, 'seed': seed, 'repeat': repeat},
+        'presets': results,
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> list:
+    regressions = []
+    for name, result in sorted(current['presets'].items()):
+        base = baseline['presets'].get(name)
+        if base is None:
+            continue
+
+        for key in ('steps_per_second', 'particles_per_second'):
+            if base[key] and result[key] < base[key] * (1.0 - threshold):
+                regressions.append(f"{name}: {key} {base[key]:.2f} -> {result[key]:.2f}")
+
+        for phase in PHASES:
+            # Fases que não existiam no JSON de referência não são comparadas
+            before = base['phase_seconds'].get(phase)
+            after = result['phase_seconds'][phase]
+            if before and after > before * (1.0 + threshold):
+                regressions.append(f"{name}: {phase} {before * 1000:.2f} ms -> {after * 1000:.2f} ms")
+
+    return regressions
+
+
+def print_results(results: dict):
+    print(f"{'preset':<28} {'passos/s':>10} {'partículas/s':>14} "
+          + " ".join(f"{phase + ' (ms)':>17}" for phase in PHASES))
+    for name, result in sorted(results['presets'].items()):
+        phases = " ".join(f"{result['phase_seconds'][phase] * 1000:17.2f}" for phase in PHASES)
+        print(f"{name:<28} {result['steps_per_second']:10.1f} {result['particles_per_second']:14.1f} {phases}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dos presets .otps por fase")
+    parser.add_argument("presets", nargs="*", help="Arquivos .otps (padrão: todos em presets/)")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--dt", type=float, default=STEP_SIZE)
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="Grava os resultados em JSON")
+    parser.add_argument("--baseline", help="JSON de referência para comparar")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Piora relativa aceita antes de acusar regressão")
+    args = parser.parse_args()
+
+    presets = args.presets
+    if not presets:
+        presets_dir = os.path.join(base_path, "presets")
+        presets = [os.path.join(presets_dir, f) for f in sorted(os.listdir(presets_dir)) if f.endswith('.otps')]
+
+    results = run_suite(presets, args.seconds, args.dt, args.seed, args.repeat)
+    print_results(results)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"✓ Resultados salvos: {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+
+        regressions = compare(baseline, results, args.threshold)
+        if regressions:
+            print(f"✗ {len(regressions)} regressões acima de {args.threshold:.0%}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print(f"✓ Sem regressões acima de {args.threshold:.0%}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
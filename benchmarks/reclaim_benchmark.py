@@ -0,0 +1,79 @@
+import os
+import sys
+import time
+import argparse
+
+base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+data_path = os.path.join(base_path, "data")
+if data_path not in sys.path:
+    sys.path.append(data_path)
+
+from particle import Particle
+from particle_type import ParticleType
+from particle_system import STEP_SIZE, ParticleSystem
+
+
+def fill(system: ParticleSystem, count: int):
+    ptype = ParticleType()
+    ptype.set_colors([(255, 255, 255, 255), (255, 0, 0, 0)], [0.0, 1.0])
+    ptype.set_size((4, 4), (2, 2))
+    descriptor = ptype.get_descriptor()
+
+    # Todas as partículas expiram no mesmo tick, como um burst inteiro
+    for i in range(count):
+        particle = Particle(
+            descriptor,
+            (float(i % 1000), float(i // 1000)),
+            (10.0, 5.0),
+            (0.0, -9.8),
+            STEP_SIZE
+        )
+        system.add_particle(particle)
+
+
+def legacy_step(system: ParticleSystem, elapsed_time: float):
+    # Laço antigo: cópia da lista e list.remove por partícula morta
+    for particle in system.particles[:]:
+        if particle.has_finished():
+            system.particles.remove(particle)
+        else:
+            for affector in system.affectors:
+                affector.update_particle(particle, elapsed_time)
+            particle.update(elapsed_time)
+
+
+def measure(count: int, mode: str) -> float:
+    system = ParticleSystem(use_pool=(mode == "pool"))
+    fill(system, count)
+
+    # Tempo total dos ticks até o sistema esvaziar
+    total = 0.0
+    while system.get_particle_count() > 0:
+        start = time.perf_counter()
+        if mode == "legacy":
+            legacy_step(system, STEP_SIZE)
+        else:
+            system.step(STEP_SIZE)
+        total += time.perf_counter() - start
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tempo de tick com expiração em massa")
+    parser.add_argument("--counts", type=int, nargs="+", default=[1000, 2000, 4000, 8000, 16000])
+    parser.add_argument("--skip-legacy-above", type=int, default=16000)
+    args = parser.parse_args()
+
+    print(f"{'vivas':>8} {'legacy (ms)':>12} {'lista (ms)':>12} {'pool (ms)':>12}")
+    for count in args.counts:
+        if count <= args.skip_legacy_above:
+            legacy = f"{measure(count, 'legacy') * 1000:12.2f}"
+        else:
+            legacy = f"{'-':>12}"
+        listed = measure(count, "list") * 1000
+        pooled = measure(count, "pool") * 1000
+        print(f"{count:8d} {legacy} {listed:12.2f} {pooled:12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+import os
+import sys
+import time
+import argparse
+
+base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+data_path = os.path.join(base_path, "data")
+if data_path not in sys.path:
+    sys.path.append(data_path)
+
+from otps_loader import load_otps_system
+from particle_system import STEP_SIZE
+from gc_monitor import GcMonitor
+
+
+def measure(filepath: str, restarts: int, steps: int, reuse: bool) -> dict:
+    # Como segurar ESPAÇO no editor: reinicia e roda alguns passos, repetidamente.
+    # O .otps é lido a cada reinício nos dois modos
+    monitor = GcMonitor()
+    monitor.install()
+    particle_system = None
+    start = time.perf_counter()
+    try:
+        for i in range(restarts):
+            particle_system = load_otps_system(filepath, (400, 300),
+                                               reuse=particle_system if reuse else None)
+            for j in range(steps):
+                particle_system.step(STEP_SIZE)
+    finally:
+        monitor.uninstall()
+    elapsed = time.perf_counter() - start
+    stats = monitor.get_stats()
+    stats['restart_ms'] = elapsed / restarts * 1000.0
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Custo de reiniciar o efeito (ESPAÇO/clique/B) com e sem reaproveitamento")
+    parser.add_argument("presets", nargs="*", help="Arquivos .otps (padrão: todos em presets/)")
+    parser.add_argument("--restarts", type=int, default=300)
+    parser.add_argument("--steps", type=int, default=10, help="Passos simulados entre reinícios")
+    args = parser.parse_args()
+
+    presets = args.presets
+    if not presets:
+        presets_dir = os.path.join(base_path, "presets")
+        presets = [os.path.join(presets_dir, f) for f in sorted(os.listdir(presets_dir)) if f.endswith('.otps')]
+
+    print(f"{'preset':<28} {'modo':>8} {'ms/reinício':>12} {'coletas':>8} {'ger. 2':>7} {'pausa máx (ms)':>15}")
+    for filepath in presets:
+        for reuse in (False, True):
+            stats = measure(filepath, args.restarts, args.steps, reuse)
+            mode = "reuso" if reuse else "novo"
+            print(f"{os.path.basename(filepath):<28} {mode:>8} {stats['restart_ms']:12.3f} "
+                  f"{stats['collections']:8d} {stats['by_generation'][2]:7d} {stats['max_pause_ms']:15.2f}")
+
+
+if __name__ == "__main__":
+    main()
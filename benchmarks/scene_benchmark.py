@@ -0,0 +1,88 @@
+import os
+import sys
+import time
+import argparse
+
+base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+data_path = os.path.join(base_path, "data")
+if data_path not in sys.path:
+    sys.path.append(data_path)
+
+import pygame
+from particle_scene import ParticleScene
+from particle_system import STEP_SIZE
+
+
+SURFACE_SIZE = (1400, 900)
+
+
+def build_scene(presets: list, effects: int, workers: int, seed: int) -> ParticleScene:
+    # Efeitos espalhados numa grade, como criaturas numa tela do cliente
+    scene = ParticleScene(workers)
+    columns = max(1, int(effects ** 0.5))
+    rows = (effects + columns - 1) // columns
+    for i in range(effects):
+        x = (i % columns + 0.5) * SURFACE_SIZE[0] / columns
+        y = (i // columns + 0.5) * SURFACE_SIZE[1] / rows
+        scene.add_effect(presets[i % len(presets)], (x, y), seed=seed + i)
+    return scene
+
+
+def measure(presets: list, effects: int, workers: int, steps: int, dt: float, seed: int) -> dict:
+    scene = build_scene(presets, effects, workers, seed)
+    surface = pygame.Surface(SURFACE_SIZE)
+    update_time = 0.0
+    render_time = 0.0
+    particle_steps = 0
+
+    for i in range(steps):
+        start = time.perf_counter()
+        scene.step(dt)
+        updated = time.perf_counter()
+        surface.fill((0, 0, 0))
+        scene.render(surface)
+        rendered = time.perf_counter()
+
+        update_time += updated - start
+        render_time += rendered - updated
+        particle_steps += scene.get_particle_count()
+
+    scene.close()
+    return {
+        'update_ms': update_time / steps * 1000.0,
+        'render_ms': render_time / steps * 1000.0,
+        'particles': particle_steps / steps,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Escala do update de uma cena com vários efeitos")
+    parser.add_argument("presets", nargs="*", help="Arquivos .otps (padrão: todos em presets/)")
+    parser.add_argument("--effects", type=int, default=48)
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=sorted({0, 1, 2, 4, os.cpu_count() or 1}))
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--dt", type=float, default=STEP_SIZE)
+    parser.add_argument("--seed", type=int, default=1234)
+    args = parser.parse_args()
+
+    presets = args.presets
+    if not presets:
+        presets_dir = os.path.join(base_path, "presets")
+        presets = [os.path.join(presets_dir, f) for f in sorted(os.listdir(presets_dir)) if f.endswith('.otps')]
+
+    steps = max(1, int(round(args.seconds / args.dt)))
+    print(f"{args.effects} efeitos, {steps} passos, {os.cpu_count()} núcleos")
+    print(f"{'workers':>8} {'update (ms)':>12} {'render (ms)':>12} {'partículas':>12} {'speedup':>8}")
+    serial = None
+    for workers in args.workers:
+        result = measure(presets, args.effects, workers, steps, args.dt, args.seed)
+        if serial is None:
+            serial = result['update_ms']
+        label = "série" if workers == 0 else str(workers)
+        print(f"{label:>8} {result['update_ms']:12.2f} {result['render_ms']:12.2f} "
+              f"{result['particles']:12.0f} {serial / result['update_ms']:8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+import os
+import sys
+import time
+import argparse
+
+base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+data_path = os.path.join(base_path, "data")
+if data_path not in sys.path:
+    sys.path.append(data_path)
+
+from otps_loader import load_otps_system
+from particle_system import STEP_SIZE
+
+
+def seek_stepped(filepath: str, seconds: float, dt: float, seed: int):
+    # Referência: simula todos os passos até o instante pedido
+    start = time.perf_counter()
+    particle_system = load_otps_system(filepath, (400, 300), seed=seed)
+    for i in range(int(round(seconds / dt))):
+        particle_system.step(dt)
+    count = particle_system.get_particle_count()
+    return time.perf_counter() - start, count
+
+
+def seek_closed_form(filepath: str, seconds: float, dt: float, seed: int):
+    start = time.perf_counter()
+    particle_system = load_otps_system(filepath, (400, 300), seed=seed, closed_form=True)
+    if particle_system.records is None:
+        return None, 0
+    particle_system.step_size = dt
+    particle_system.seek(seconds)
+    count = particle_system.get_particle_count()
+    seeked = time.perf_counter() - start
+
+    # Voltar no tempo já não emite nada: só a avaliação
+    start = time.perf_counter()
+    particle_system.seek(seconds / 2)
+    particle_system.get_particle_count()
+    return seeked, count, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Custo de posicionar um efeito num instante qualquer")
+    parser.add_argument("presets", nargs="*", help="Arquivos .otps (padrão: todos em presets/)")
+    parser.add_argument("--seconds", type=float, nargs="+", default=[1.0, 10.0, 60.0])
+    parser.add_argument("--dt", type=float, default=STEP_SIZE)
+    parser.add_argument("--seed", type=int, default=1234)
+    args = parser.parse_args()
+
+    presets = args.presets
+    if not presets:
+        presets_dir = os.path.join(base_path, "presets")
+        presets = [os.path.join(presets_dir, f) for f in sorted(os.listdir(presets_dir)) if f.endswith('.otps')]
+
+    print(f"{'preset':<28} {'instante':>9} {'passos (ms)':>12} {'fechada (ms)':>13} "
+          f"{'voltar (ms)':>12} {'partículas':>11}")
+    for filepath in presets:
+        name = os.path.basename(filepath)
+        for seconds in args.seconds:
+            stepped, count = seek_stepped(filepath, seconds, args.dt, args.seed)
+            result = seek_closed_form(filepath, seconds, args.dt, args.seed)
+            if result[0] is None:
+                print(f"{name:<28} {seconds:9.1f} {stepped * 1000:12.2f} {'(affectors)':>13} {'':>12} {count:11d}")
+                continue
+            seeked, closed_count, back = result
+            print(f"{name:<28} {seconds:9.1f} {stepped * 1000:12.2f} {seeked * 1000:13.2f} "
+                  f"{back * 1000:12.2f} {closed_count:11d}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+import os
+import sys
+import time
+import argparse
+
+base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+data_path = os.path.join(base_path, "data")
+if data_path not in sys.path:
+    sys.path.append(data_path)
+
+import numpy as np
+import pygame
+from particle_type import ParticleType
+from particle_pool import ParticlePool
+from particle_renderer import ParticleRenderer, SPLAT_THRESHOLD
+from sprite_cache import SpriteCache
+
+
+SURFACE_SIZE = (1400, 900)
+MODES = {"normal": 0, "addition": 1, "multiply": 2}
+
+
+def fill(pool: ParticlePool, count: int, size: int, mode: int, seed: int):
+    ptype = ParticleType()
+    ptype.set_colors([(255, 200, 80, 255), (255, 40, 0, 60)], [0.0, 1.0])
+    ptype.set_size((size, size), (size, size))
+    ptype.shape = 1
+    ptype.composition_mode = mode
+
+    rng = np.random.default_rng(seed)
+    positions = rng.random((count, 2)) * SURFACE_SIZE
+    zeros = np.zeros((count, 2))
+    durations = np.full(count, 2.0)
+    pool.add_particles(ptype, positions, zeros, zeros, durations, np.ones(count))
+
+    # Idades diferentes para espalhar as cores pela tabela
+    pool.elapsed_time[:count] = rng.random(count) * 2.0
+    pool.update(0.0)
+
+
+def measure(count: int, size: int, mode: int, threshold: int, frames: int, seed: int) -> float:
+    pool = ParticlePool()
+    fill(pool, count, size, mode, seed)
+    renderer = ParticleRenderer(SpriteCache(), splat_threshold=threshold)
+    surface = pygame.Surface(SURFACE_SIZE)
+
+    # Primeiro quadro aquece o cache de sprites
+    renderer.render_pool(surface, pool)
+    start = time.perf_counter()
+    for i in range(frames):
+        surface.fill((0, 0, 0))
+        renderer.render_pool(surface, pool)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Partículas/s: sprites por blit x splat no buffer")
+    parser.add_argument("--counts", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--mode", choices=sorted(MODES), default="addition")
+    parser.add_argument("--frames", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=1234)
+    args = parser.parse_args()
+
+    mode = MODES[args.mode]
+    print(f"{'tamanho':>8} {'vivas':>8} {'sprites (p/s)':>15} {'splat (p/s)':>15}")
+    for size in args.sizes:
+        for count in args.counts:
+            sprites = measure(count, size, mode, 0, args.frames, args.seed)
+            splat = measure(count, size, mode, max(size, SPLAT_THRESHOLD), args.frames, args.seed)
+            rendered = count * args.frames
+            print(f"{size:8d} {count:8d} {rendered / sprites:15.0f} {rendered / splat:15.0f}")
+
+
+if __name__ == "__main__":
+    main()
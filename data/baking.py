@@ -0,0 +1,160 @@
+import os
+import json
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, Future
+from typing import Deque, List, Optional, Tuple
+import numpy as np
+import pygame
+from sprite_cache import COMPOSITION_ADDITION
+from otps_loader import load_otps_system
+from particle_system import STEP_SIZE, ParticleSystem
+
+
+def encode_png(path: str, size: Tuple[int, int], pixels: bytes) -> str:
+    # Roda nos processos do pool: só recebe bytes, Surface não é serializável
+    surface = pygame.image.frombuffer(pixels, size, 'RGBA')
+    pygame.image.save(surface, path)
+    return path
+
+
+class PngWriter:
+    """Codifica PNGs em um pool de processos com no máximo max_pending imagens em
+    trânsito, para que efeitos longos não acumulem quadros na memória"""
+
+    def __init__(self, workers: Optional[int] = None, max_pending: Optional[int] = None):
+        # workers=0 codifica no próprio processo
+        self.executor = ProcessPoolExecutor(workers) if workers != 0 else None
+        worker_count = (workers or os.cpu_count() or 1) if self.executor is not None else 1
+        self.max_pending = max_pending or worker_count * 2
+        self.pending: Deque[Future] = deque()
+        self.written: List[str] = []
+        self.wait_time = 0.0
+
+    def write(self, path: str, surface: pygame.Surface):
+        pixels = pygame.image.tostring(surface, 'RGBA')
+        if self.executor is None:
+            self.written.append(encode_png(path, surface.get_size(), pixels))
+            return
+
+        while len(self.pending) >= self.max_pending:
+            self.collect()
+        self.pending.append(self.executor.submit(encode_png, path, surface.get_size(), pixels))
+
+    def collect(self):
+        start = time.perf_counter()
+        self.written.append(self.pending.popleft().result())
+        self.wait_time += time.perf_counter() - start
+
+    def close(self):
+        while self.pending:
+            self.collect()
+        if self.executor is not None:
+            self.executor.shutdown()
+
+
+def additive_to_alpha(surface: pygame.Surface):
+    # Soma sobre fundo transparente só mexe no RGB; converte para alfa
+    # straight (alfa = maior canal) para que, desenhado sobre preto, o
+    # quadro fique igual ao efeito aditivo
+    rgb = pygame.surfarray.pixels3d(surface)
+    alpha = pygame.surfarray.pixels_alpha(surface)
+    peak = rgb.max(axis=2)
+    lit = peak > alpha
+    if lit.any():
+        scale = 255.0 / peak[lit]
+        rgb[lit] = np.minimum(255, rgb[lit] * scale[:, None] + 0.5).astype(np.uint8)
+        alpha[lit] = peak[lit]
+    del rgb
+    del alpha
+
+
+def is_blank(surface: pygame.Surface, background: Tuple[int, int, int, int]) -> bool:
+    # Nenhum pixel diferente do fundo: nada foi desenhado no quadro
+    pixels = pygame.surfarray.pixels2d(surface)
+    blank = not (pixels != surface.map_rgb(background)).any()
+    del pixels
+    return blank
+
+
+def render_frames(particle_system: ParticleSystem, frames: int, dt: float, size: Tuple[int, int],
+                  background: Tuple[int, int, int, int]):
+    # Um quadro por passo fixo; a mesma superfície é reaproveitada a cada quadro
+    surface = pygame.Surface(size, pygame.SRCALPHA)
+    additive = background[3] == 0 and any(
+        emitter.particle_type is not None and emitter.particle_type.composition_mode == COMPOSITION_ADDITION
+        for emitter in particle_system.emitters)
+
+    for i in range(frames):
+        particle_system.step(dt)
+        surface.fill(background)
+        particle_system.render(surface)
+        if additive:
+            additive_to_alpha(surface)
+        yield surface
+
+
+def bake_otps(
+    filepath: str,
+    output_dir: str,
+    frames: int = 60,
+    dt: float = STEP_SIZE,
+    size: Tuple[int, int] = (256, 256),
+    sheet: bool = False,
+    columns: int = 8,
+    rows: int = 8,
+    background: Tuple[int, int, int, int] = (0, 0, 0, 0),
+    seed: Optional[int] = None,
+    workers: Optional[int] = None
+) -> Optional[dict]:
+    """Renderiza um preset sem janela em PNGs numerados ou folhas de sprites"""
+    width, height = size
+    particle_system = load_otps_system(filepath, (width // 2, height // 2), seed=seed, step_size=dt)
+    if particle_system is None:
+        return None
+
+    os.makedirs(output_dir, exist_ok=True)
+    name = os.path.splitext(os.path.basename(filepath))[0]
+    writer = PngWriter(workers)
+    blank_frames = 0
+    start = time.perf_counter()
+
+    try:
+        if sheet:
+            # Uma folha de columns x rows quadros por vez; só ela fica na memória
+            per_sheet = columns * rows
+            sheet_surface = pygame.Surface((width * columns, height * rows), pygame.SRCALPHA)
+            for i, frame in enumerate(render_frames(particle_system, frames, dt, size, background)):
+                blank_frames += is_blank(frame, background)
+                cell = i % per_sheet
+                if cell == 0:
+                    sheet_surface.fill((0, 0, 0, 0))
+                sheet_surface.blit(frame, ((cell % columns) * width, (cell // columns) * height))
+                if cell == per_sheet - 1 or i == frames - 1:
+                    path = os.path.join(output_dir, f"{name}_sheet_{i // per_sheet:03d}.png")
+                    writer.write(path, sheet_surface)
+        else:
+            for i, frame in enumerate(render_frames(particle_system, frames, dt, size, background)):
+                blank_frames += is_blank(frame, background)
+                writer.write(os.path.join(output_dir, f"{name}_{i:04d}.png"), frame)
+    finally:
+        writer.close()
+
+    metadata = {
+        'preset': os.path.basename(filepath),
+        'frames': frames,
+        'dt': dt,
+        'frame_size': [width, height],
+        'layout': 'sheet' if sheet else 'sequence',
+        'columns': columns if sheet else 1,
+        'rows': rows if sheet else 1,
+        'files': [os.path.basename(path) for path in writer.written],
+        'seed': seed,
+    }
+    with open(os.path.join(output_dir, f"{name}.json"), 'w', encoding='utf-8') as f:
+        json.dump(metadata, f, indent=2)
+
+    metadata['blank_frames'] = blank_frames
+    metadata['bake_time'] = time.perf_counter() - start
+    metadata['encode_wait'] = writer.wait_time
+    return metadata
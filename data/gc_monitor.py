@@ -0,0 +1,55 @@
+import gc
+import time
+from typing import List
+
+
+class GcMonitor:
+    """Conta as coletas do gc e o tempo de cada pausa, via gc.callbacks"""
+
+    def __init__(self):
+        self.collections: List[int] = [0, 0, 0]
+        self.collected = 0
+        self.pause_time = 0.0
+        self.max_pause = 0.0
+        self.last_pause = 0.0
+        self.started = 0.0
+        self.installed = False
+
+    def install(self):
+        if not self.installed:
+            gc.callbacks.append(self.callback)
+            self.installed = True
+
+    def uninstall(self):
+        if self.installed:
+            gc.callbacks.remove(self.callback)
+            self.installed = False
+
+    def callback(self, phase: str, info: dict):
+        if phase == 'start':
+            self.started = time.perf_counter()
+            return
+
+        pause = time.perf_counter() - self.started
+        self.collections[info['generation']] += 1
+        self.collected += info['collected']
+        self.pause_time += pause
+        self.max_pause = max(self.max_pause, pause)
+        self.last_pause = pause
+
+    def reset(self):
+        self.collections = [0, 0, 0]
+        self.collected = 0
+        self.pause_time = 0.0
+        self.max_pause = 0.0
+        self.last_pause = 0.0
+
+    def get_stats(self) -> dict:
+        return {
+            'collections': sum(self.collections),
+            'by_generation': list(self.collections),
+            'collected': self.collected,
+            'pause_ms': self.pause_time * 1000.0,
+            'max_pause_ms': self.max_pause * 1000.0,
+            'last_pause_ms': self.last_pause * 1000.0,
+        }
@@ -0,0 +1,459 @@
+import copy
+from typing import List, Optional, Tuple
+import pygame
+from particle_type import ParticleType
+from particle_emitter import ParticleEmitter
+from particle_system import STEP_SIZE, ParticleSystem
+from particle_affector import GravityAffector, AttractionAffector
+
+
+DEFAULT_PARTICLE_PARAMS = {
+
+    'min_position_radius': 0.0,
+    'max_position_radius': 800.0,
+    'min_position_angle': 0.0,
+    'max_position_angle': 360.0,
+
+    # Velocity
+    'min_velocity': 10.0,
+    'max_velocity': 150.0,
+    'min_velocity_angle': 30.0,
+    'max_velocity_angle': 50.0,
+
+    # Acceleration
+    'min_acceleration': 0.0,
+    'max_acceleration': 20.0,
+    'min_acceleration_angle': 0.0,
+    'max_acceleration_angle': 360.0,
+
+    # Duration
+    'min_duration': 0,
+    'max_duration': 3.5,
+    'ignore_physics_after': -1.0,
+
+    # Size
+    'start_size': 8,
+    'final_size': 4,
+    'random_size_multiplier': 1.0,
+
+    # Visual
+    'use_texture': False,
+    'composition_mode': 1,  # 0=normal, 1=additive, 2=multiply
+    'particle_shape': 0,
+}
+
+DEFAULT_EMITTER_PARAMS = {
+    'burst_rate': 25.0,
+    'burst_count': 1,
+    'duration': 10,
+    'delay': 0.1,
+    'prewarm': 0.0,
+}
+
+DEFAULT_AFFECTOR_PARAMS = {
+
+    'use_gravity': False,
+    'gravity_angle': 180.0,
+    'gravity_strength': 100.0,
+
+
+    'use_attraction': False,
+    'attraction_acceleration': 1000.0,
+    'attraction_reduction': 0.0,
+    'attraction_repelish': False,
+}
+
+DEFAULT_COLORS = [
+    [255, 255, 0, 255],
+    [255, 128, 0, 200],
+    [255, 0, 0, 100],
+    [50, 50, 50, 0]
+]
+
+DEFAULT_STOPS = [0.0, 0.3, 0.6, 1.0]
+
+
+def parse_otps_file(filepath):
+
+    try:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            lines = f.readlines()
+
+        params = {}
+        current_section = None
+
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+
+            # Detectar seções
+            if line in ['Particle', 'Effect', 'System', 'Emitter', 'GravityAffector', 'AttractionAffector']:
+                current_section = line
+                continue
+
+            # Parse de parâmetros key: value
+            if ':' in line:
+                key, value = line.split(':', 1)
+                key = key.strip()
+                value = value.strip()
+
+                # Converter valores
+                if current_section == 'Particle':
+                    if key == 'duration':
+                        params['max_duration'] = float(value)
+                    elif key == 'min-position-radius':
+                        params['min_position_radius'] = float(value)
+                    elif key == 'max-position-radius':
+                        params['max_position_radius'] = float(value)
+                    elif key == 'min-position-angle':
+                        params['min_position_angle'] = float(value)
+                    elif key == 'max-position-angle':
+                        params['max_position_angle'] = float(value)
+                    elif key == 'min-velocity':
+                        params['min_velocity'] = float(value)
+                    elif key == 'max-velocity':
+                        params['max_velocity'] = float(value)
+                    elif key == 'min-velocity-angle':
+                        params['min_velocity_angle'] = float(value)
+                    elif key == 'max-velocity-angle':
+                        params['max_velocity_angle'] = float(value)
+                    elif key == 'min-acceleration':
+                        params['min_acceleration'] = float(value)
+                    elif key == 'max-acceleration':
+                        params['max_acceleration'] = float(value)
+                    elif key == 'min-acceleration-angle':
+                        params['min_acceleration_angle'] = float(value)
+                    elif key == 'max-acceleration-angle':
+                        params['max_acceleration_angle'] = float(value)
+                    elif key == 'ignore-physics-after':
+                        params['ignore_physics_after'] = float(value)
+                    elif key == 'size':
+                        sizes = value.split()
+                        if len(sizes) >= 2:
+                            params['start_size'] = int(sizes[0])
+                            params['final_size'] = int(sizes[1])
+                    elif key == 'composition-mode':
+                        modes = {'normal': 0, 'addition': 1, 'multiply': 2}
+                        params['composition_mode'] = modes.get(value, 0)
+                    elif key == 'colors':
+                        colors = value.split()
+                        parsed_colors = []
+                        for c in colors:
+                            if c.startswith('#'):
+                                r = int(c[1:3], 16)
+                                g = int(c[3:5], 16)
+                                b = int(c[5:7], 16)
+                                a = int(c[7:9], 16) if len(c) > 7 else 255
+                                parsed_colors.append([r, g, b, a])
+                        params['colors'] = parsed_colors
+                    elif key == 'colors-stops':
+                        stops = [float(s) for s in value.split()]
+                        params['color_stops'] = stops
+
+                elif current_section == 'Emitter':
+                    if key == 'burst-rate':
+                        params['burst_rate'] = float(value)
+                    elif key == 'burst-count':
+                        params['burst_count'] = int(value)
+                    elif key == 'duration':
+                        params['emitter_duration'] = float(value)
+                    elif key == 'delay':
+                        params['delay'] = float(value)
+                    elif key == 'prewarm':
+                        params['prewarm'] = float(value)
+
+                elif current_section == 'GravityAffector':
+                    params['use_gravity'] = True
+                    if key == 'angle':
+                        params['gravity_angle'] = float(value)
+                    elif key == 'gravity':
+                        params['gravity_strength'] = float(value)
+
+                elif current_section == 'AttractionAffector':
+                    params['use_attraction'] = True
+                    if key == 'acceleration':
+                        params['attraction_acceleration'] = float(value)
+                    elif key == 'reduction':
+                        params['attraction_reduction'] = float(value)
+                    elif key == 'repelish':
+                        params['attraction_repelish'] = value.lower() == 'true'
+
+        return params
+
+    except Exception as e:
+        print(f"✗ Erro ao carregar preset: {e}")
+        return None
+
+
+def apply_otps_params(params: dict, particle_params: dict, emitter_params: dict, affector_params: dict):
+
+    # Aplicar parâmetros de partícula
+    for key in ['min_position_radius', 'max_position_radius', 'min_position_angle', 'max_position_angle',
+                'min_velocity', 'max_velocity', 'min_velocity_angle', 'max_velocity_angle',
+                'min_acceleration', 'max_acceleration', 'min_acceleration_angle', 'max_acceleration_angle',
+                'max_duration', 'ignore_physics_after', 'start_size', 'final_size', 'composition_mode']:
+        if key in params:
+            particle_params[key] = params[key]
+
+    # Aplicar parâmetros de emissor
+    for key in ['burst_rate', 'burst_count', 'delay']:
+        if key in params:
+            emitter_params[key] = params[key]
+
+    if 'emitter_duration' in params:
+        emitter_params['duration'] = params['emitter_duration']
+
+    # Sem a chave o preset começa do zero, mesmo que o anterior tivesse prewarm
+    emitter_params['prewarm'] = params.get('prewarm', 0.0)
+
+    # Aplicar affectors
+    if 'use_gravity' in params:
+        affector_params['use_gravity'] = params['use_gravity']
+        if 'gravity_angle' in params:
+            affector_params['gravity_angle'] = params['gravity_angle']
+        if 'gravity_strength' in params:
+            affector_params['gravity_strength'] = params['gravity_strength']
+
+    if 'use_attraction' in params:
+        affector_params['use_attraction'] = params['use_attraction']
+        if 'attraction_acceleration' in params:
+            affector_params['attraction_acceleration'] = params['attraction_acceleration']
+        if 'attraction_reduction' in params:
+            affector_params['attraction_reduction'] = params['attraction_reduction']
+        if 'attraction_repelish' in params:
+            affector_params['attraction_repelish'] = params['attraction_repelish']
+
+
+def apply_otps_colors(params: dict, colors: List[List[int]], stops: List[float]) -> Tuple[List[List[int]], List[float]]:
+
+    if 'colors' in params and len(params['colors']) > 0:
+        colors = params['colors'][:4]  # Máximo 4 cores
+        # Preencher com cores padrão se necessário
+        while len(colors) < 4:
+            colors.append([255, 255, 255, 255])
+
+    if 'color_stops' in params and len(params['color_stops']) > 0:
+        stops = params['color_stops'][:4]
+        # Preencher stops
+        while len(stops) < 4:
+            stops.append(1.0)
+
+    return colors, stops
+
+
+def create_particle_type(particle_params: dict, colors: List[List[int]], stops: List[float],
+                         texture: Optional[pygame.Surface] = None) -> ParticleType:
+
+    ptype = ParticleType("custom")
+    configure_particle_type(ptype, particle_params, colors, stops, texture)
+    return ptype
+
+
+def configure_particle_type(ptype: ParticleType, particle_params: dict, colors: List[List[int]],
+                            stops: List[float], texture: Optional[pygame.Surface] = None):
+
+    ptype.set_texture(texture if particle_params['use_texture'] and texture else None)
+
+    ptype.set_colors([tuple(c) for c in colors], list(stops))
+
+    # Position
+    ptype.set_position_radius(
+        particle_params['min_position_radius'],
+        particle_params['max_position_radius']
+    )
+    ptype.set_position_angle(
+        particle_params['min_position_angle'],
+        particle_params['max_position_angle']
+    )
+
+    # Velocity
+    ptype.set_velocity(
+        particle_params['min_velocity'],
+        particle_params['max_velocity']
+    )
+    ptype.set_velocity_angle(
+        particle_params['min_velocity_angle'],
+        particle_params['max_velocity_angle']
+    )
+
+    # Acceleration
+    ptype.set_acceleration(
+        particle_params['min_acceleration'],
+        particle_params['max_acceleration']
+    )
+    ptype.set_acceleration_angle(
+        particle_params['min_acceleration_angle'],
+        particle_params['max_acceleration_angle']
+    )
+
+    # Duration
+    ptype.set_duration(
+        particle_params['min_duration'],
+        particle_params['max_duration']
+    )
+    ptype.ignore_physics_after = particle_params['ignore_physics_after']
+
+    # Size
+    ptype.start_size = (particle_params['start_size'], particle_params['start_size'])
+    ptype.final_size = (particle_params['final_size'], particle_params['final_size'])
+    ptype.random_size_multiplier = (
+        particle_params['random_size_multiplier'],
+        particle_params['random_size_multiplier']
+    )
+
+    ptype.shape = particle_params['particle_shape']
+    ptype.composition_mode = particle_params['composition_mode']
+    ptype.source_key = particle_type_key(particle_params, colors, stops, texture)
+
+
+def particle_type_key(particle_params: dict, colors: List[List[int]], stops: List[float],
+                      texture: Optional[pygame.Surface] = None) -> tuple:
+    # Tudo o que define o tipo; igual = o ParticleType (e sua tabela de cores) serve de novo
+    return (tuple(sorted(particle_params.items())), tuple(tuple(c) for c in colors), tuple(stops),
+            texture if particle_params['use_texture'] else None)
+
+
+def create_particle_system(particle_params: dict, emitter_params: dict, affector_params: dict,
+                           colors: List[List[int]], stops: List[float], position: Tuple[float, float],
+                           texture: Optional[pygame.Surface] = None, use_pool: bool = True,
+                           closed_form: bool = False, seed: Optional[int] = None,
+                           reuse: Optional[ParticleSystem] = None,
+                           step_size: float = STEP_SIZE) -> ParticleSystem:
+
+    # Forma fechada só vale sem affectors; com eles o sistema é simulado passo a passo
+    closed_form = closed_form and not (affector_params['use_gravity'] or affector_params['use_attraction'])
+
+    # reuse: sistema anterior reiniciado no lugar, com arrays, emissor, tipo e affectors
+    if (reuse is not None and (reuse.records is not None) == closed_form
+            and (reuse.pool is not None) == (use_pool or closed_form)):
+        particle_system = reuse
+        particle_system.reset()
+        particle_system.step_size = step_size
+        emitter = particle_system.added_emitters[0] if particle_system.added_emitters else ParticleEmitter()
+        previous = {type(affector): affector for affector in particle_system.added_affectors}
+        particle_system.clear_emitters()
+        particle_system.clear_affectors()
+    else:
+        particle_system = ParticleSystem(use_pool=use_pool, step_size=step_size, closed_form=closed_form)
+        emitter = ParticleEmitter()
+        previous = {}
+
+    emitter.set_position(position)
+    emitter.set_burst_rate(emitter_params['burst_rate'])
+    emitter.set_burst_count(emitter_params['burst_count'])
+    emitter.set_duration(emitter_params['duration'])
+    emitter.set_delay(emitter_params['delay'])
+    emitter.set_prewarm(emitter_params.get('prewarm', 0.0))
+
+    key = particle_type_key(particle_params, colors, stops, texture)
+    if emitter.particle_type is None or emitter.particle_type.source_key != key:
+        emitter.set_particle_type(create_particle_type(particle_params, colors, stops, texture))
+
+    particle_system.add_emitter(emitter)
+
+    # Affectors
+    if affector_params['use_gravity']:
+        gravity = previous.get(GravityAffector) or GravityAffector()
+        gravity.reset()
+        gravity.set_angle(affector_params['gravity_angle'])
+        gravity.gravity = affector_params['gravity_strength']
+        particle_system.add_affector(gravity)
+
+    if affector_params['use_attraction']:
+        attraction = previous.get(AttractionAffector) or AttractionAffector()
+        attraction.reset()
+        attraction.position = position
+        attraction.acceleration = affector_params['attraction_acceleration']
+        attraction.reduction = affector_params['attraction_reduction']
+        attraction.repelish = affector_params['attraction_repelish']
+        particle_system.add_affector(attraction)
+
+    # A semente vem antes do prewarm para que ele também se repita
+    if seed is not None:
+        particle_system.set_seed(seed)
+    particle_system.prewarm()
+    return particle_system
+
+
+def update_particle_system(particle_system: ParticleSystem, particle_params: dict, emitter_params: dict,
+                           affector_params: dict, colors: List[List[int]], stops: List[float],
+                           texture: Optional[pygame.Surface] = None) -> bool:
+    """Aplica parâmetros editados ao sistema em execução, sem descartar as partículas
+    vivas. Retorna False quando só recriando (sem emissor ou forma fechada com affectors)"""
+    if not particle_system.added_emitters:
+        return False
+    if particle_system.records is not None and (affector_params['use_gravity'] or affector_params['use_attraction']):
+        return False
+
+    emitter = particle_system.added_emitters[0]
+    emitter.set_burst_count(emitter_params['burst_count'])
+    emitter.set_duration(emitter_params['duration'])
+    emitter.set_delay(emitter_params['delay'])
+    emitter.set_burst_rate(emitter_params['burst_rate'])
+    emitter.set_prewarm(emitter_params.get('prewarm', 0.0))
+
+    # Duração maior reabre um emissor que já tinha terminado
+    if emitter.finished and (emitter.duration <= 0 or emitter.elapsed_time < emitter.duration + emitter.delay):
+        emitter.finished = False
+        # Terminado no último passo ainda pode estar na lista: não entra duas vezes
+        if emitter not in particle_system.emitters:
+            particle_system.emitters.append(emitter)
+        particle_system.finished = False
+
+    # Tipo alterado no lugar: tabela de cores refeita e partículas vivas com o novo visual
+    ptype = emitter.particle_type
+    if ptype.source_key != particle_type_key(particle_params, colors, stops, texture):
+        old = ptype.get_descriptor()
+        configure_particle_type(ptype, particle_params, colors, stops, texture)
+        new = ptype.get_descriptor()
+        if new is not old:
+            particle_system.replace_descriptor(old, new)
+
+    current = {type(affector): affector for affector in particle_system.added_affectors}
+
+    gravity = current.get(GravityAffector)
+    if affector_params['use_gravity']:
+        if gravity is None:
+            gravity = GravityAffector()
+            particle_system.add_affector(gravity)
+        gravity.set_angle(affector_params['gravity_angle'])
+        gravity.gravity = affector_params['gravity_strength']
+    elif gravity is not None:
+        particle_system.remove_affector(gravity)
+
+    attraction = current.get(AttractionAffector)
+    if affector_params['use_attraction']:
+        if attraction is None:
+            attraction = AttractionAffector(position=emitter.position)
+            particle_system.add_affector(attraction)
+        attraction.acceleration = affector_params['attraction_acceleration']
+        attraction.reduction = affector_params['attraction_reduction']
+        attraction.repelish = affector_params['attraction_repelish']
+    elif attraction is not None:
+        particle_system.remove_affector(attraction)
+
+    return True
+
+
+def load_otps_system(filepath: str, position: Tuple[float, float] = (0, 0),
+                     use_pool: bool = True, seed: Optional[int] = None,
+                     closed_form: bool = False, step_size: float = STEP_SIZE,
+                     reuse: Optional[ParticleSystem] = None) -> Optional[ParticleSystem]:
+    """Monta um ParticleSystem a partir de um .otps, sem janela nem editor; step_size
+    é o passo em que o chamador vai simular, usado também no prewarm"""
+    params = parse_otps_file(filepath)
+    if not params:
+        return None
+
+    particle_params = copy.deepcopy(DEFAULT_PARTICLE_PARAMS)
+    emitter_params = copy.deepcopy(DEFAULT_EMITTER_PARAMS)
+    affector_params = copy.deepcopy(DEFAULT_AFFECTOR_PARAMS)
+    apply_otps_params(params, particle_params, emitter_params, affector_params)
+    colors, stops = apply_otps_colors(params, copy.deepcopy(DEFAULT_COLORS), list(DEFAULT_STOPS))
+
+    particle_system = create_particle_system(particle_params, emitter_params, affector_params,
+                                             colors, stops, position, use_pool=use_pool,
+                                             closed_form=closed_form, seed=seed, step_size=step_size,
+                                             reuse=reuse)
+    return particle_system
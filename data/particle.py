@@ -1,122 +1,166 @@
 
-import math
-from typing import List, Tuple, Optional
+from typing import Tuple, Optional
 import pygame
+from particle_type import ParticleDescriptor
+from sprite_cache import SpriteCache, BLEND_FLAGS, COMPOSITION_NORMAL, SIMPLE_COLOR_STEP
 
 class Particle:
+    # Só o estado próprio de cada partícula; tamanhos, cores, textura e
+    # forma ficam no descritor compartilhado do tipo
+    __slots__ = (
+        'descriptor',
+        'x', 'y',
+        'vx', 'vy',
+        'ax', 'ay',
+        'duration',
+        'elapsed_time',
+        'age',
+        'size_multiplier',
+        'finished',
+    )
+
     def __init__(
         self,
+        descriptor: ParticleDescriptor,
         position: Tuple[float, float],
-        start_size: Tuple[int, int],
-        final_size: Tuple[int, int],
         velocity: Tuple[float, float],
         acceleration: Tuple[float, float],
         duration: float,
-        ignore_physics_after: float,
-        colors: List[Tuple[int, int, int, int]],
-        colors_stops: List[float],
-        texture: Optional[pygame.Surface] = None,
-        shape: int = 0
+        size_multiplier: float = 1.0
     ):
-        self.position = list(position)
-        self.velocity = list(velocity)
-        self.acceleration = list(acceleration)
-        self.start_size = start_size
-        self.final_size = final_size
-        self.size = list(start_size)
+        self.descriptor = descriptor
+        self.x, self.y = position
+        self.vx, self.vy = velocity
+        self.ax, self.ay = acceleration
         self.duration = duration
-        self.ignore_physics_after = ignore_physics_after
-        self.colors = colors.copy()
-        self.colors_stops = colors_stops.copy()
-        self.texture = texture
         self.elapsed_time = 0.0
+        # Idade usada por cor e tamanho: a de antes do último update, como no pool
+        self.age = 0.0
+        self.size_multiplier = size_multiplier
         self.finished = False
-        self.color = colors[0] if colors else (255, 255, 255, 255)
-        self.shape = shape       
 
     def update(self, elapsed_time: float):
         if self.duration >= 0 and self.elapsed_time >= self.duration:
             self.finished = True
             return
 
-        self.update_color()
-        self.update_size()
+        self.age = self.elapsed_time
         self.update_position(elapsed_time)
         self.elapsed_time += elapsed_time
 
     def update_position(self, elapsed_time: float):
-        if self.ignore_physics_after < 0 or self.elapsed_time < self.ignore_physics_after:
+        ignore_physics_after = self.descriptor.ignore_physics_after
+        if ignore_physics_after < 0 or self.elapsed_time < ignore_physics_after:
 
-            delta_x = self.velocity[0] * elapsed_time
-            delta_y = -self.velocity[1] * elapsed_time  
-            self.position[0] += delta_x
-            self.position[1] += delta_y
+            self.x += self.vx * elapsed_time
+            self.y -= self.vy * elapsed_time
 
-            self.velocity[0] += self.acceleration[0] * elapsed_time
-            self.velocity[1] += self.acceleration[1] * elapsed_time
+            self.vx += self.ax * elapsed_time
+            self.vy += self.ay * elapsed_time
 
-    def update_size(self):
-        if self.duration <= 0:
-            return
+    @property
+    def start_size(self) -> Tuple[int, int]:
+        size = self.descriptor.start_size
+        return (int(size[0] * self.size_multiplier), int(size[1] * self.size_multiplier))
 
-        factor = self.elapsed_time / self.duration
-        self.size[0] = self.start_size[0] + (self.final_size[0] - self.start_size[0]) * factor
-        self.size[1] = self.start_size[1] + (self.final_size[1] - self.start_size[1]) * factor
+    @property
+    def final_size(self) -> Tuple[int, int]:
+        size = self.descriptor.final_size
+        return (int(size[0] * self.size_multiplier), int(size[1] * self.size_multiplier))
 
-    def update_color(self):
-        if self.duration <= 0 or len(self.colors) == 0:
-            return
+    @property
+    def size(self) -> Tuple[float, float]:
+        start_size = self.start_size
+        if self.duration <= 0:
+            return start_size
+
+        final_size = self.final_size
+        factor = self.age / self.duration
+        return (
+            start_size[0] + (final_size[0] - start_size[0]) * factor,
+            start_size[1] + (final_size[1] - start_size[1]) * factor
+        )
+
+    @property
+    def color(self) -> Tuple[int, int, int, int]:
+        color_table = self.descriptor.color_table
+        if self.duration <= 0:
+            return color_table[0]
 
-        current_life = self.elapsed_time / self.duration
-
-        if len(self.colors_stops) > 1 and current_life < self.colors_stops[1]:
-            range_val = self.colors_stops[1] - self.colors_stops[0]
-            if range_val > 0:
-                factor = (current_life - self.colors_stops[0]) / range_val
-                c1 = self.colors[0]
-                c2 = self.colors[1]
-                self.color = tuple(int(c1[i] * (1.0 - factor) + c2[i] * factor) for i in range(4))
-        elif len(self.colors) > 1:
-            self.colors.pop(0)
-            self.colors_stops.pop(0)
-        elif self.colors:
-            self.color = self.colors[0]
-
-    def render(self, surface: pygame.Surface):
+        last = len(color_table) - 1
+        index = int(self.age / self.duration * last)
+        return color_table[min(max(index, 0), last)]
+
+    def render(self, surface: pygame.Surface, cache: Optional[SpriteCache] = None, simplify: bool = False):
+        # simplify: orçamento estourado, a textura vira o stamp da forma e a cor
+        # usa o degrau mais grosso, como no ParticleRenderer
         if self.finished:
             return
-        
-        x = int(self.position[0])
-        y = int(self.position[1])
-        
-        if self.texture:
-            scaled = pygame.transform.scale(self.texture, (int(self.size[0]), int(self.size[1])))
-            scaled.set_alpha(self.color[3])
-            surface.blit(scaled, (x - int(self.size[0] / 2), y - int(self.size[1] / 2)))
-        else:
-            if self.shape == 0:  
-                radius = int(max(self.size[0], self.size[1]) / 2)
-                if radius > 0:
-                    circle_surface = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
-                    pygame.draw.circle(circle_surface, self.color, (radius, radius), radius)
-                    surface.blit(circle_surface, (x - radius, y - radius))
-            else:  
-                rect_surface = pygame.Surface((int(self.size[0]), int(self.size[1])), pygame.SRCALPHA)
-                rect_surface.fill(self.color)
-                surface.blit(rect_surface, (x - int(self.size[0] / 2), y - int(self.size[1] / 2)))
 
+        descriptor = self.descriptor
+        color = self.color
+        texture = descriptor.texture
+        if simplify:
+            texture = None
+            if cache is not None:
+                color = cache.quantize_color(color, SIMPLE_COLOR_STEP)
+        draw_particle(surface, self.x, self.y, self.size, color, texture, descriptor.shape,
+                      cache, descriptor.composition_mode)
 
     def get_position(self) -> Tuple[float, float]:
-        return tuple(self.position)
+        return (self.x, self.y)
 
     def get_velocity(self) -> Tuple[float, float]:
-        return tuple(self.velocity)
+        return (self.vx, self.vy)
 
     def set_position(self, position: Tuple[float, float]):
-        self.position = list(position)
+        self.x, self.y = position
 
     def set_velocity(self, velocity: Tuple[float, float]):
-        self.velocity = list(velocity)
+        self.vx, self.vy = velocity
 
     def has_finished(self) -> bool:
         return self.finished
+
+
+def draw_particle(
+    surface: pygame.Surface,
+    x: float,
+    y: float,
+    size: Tuple[float, float],
+    color: Tuple[int, int, int, int],
+    texture: Optional[pygame.Surface] = None,
+    shape: int = 0,
+    cache: Optional[SpriteCache] = None,
+    composition_mode: int = COMPOSITION_NORMAL
+):
+    x = int(x)
+    y = int(y)
+    flags = BLEND_FLAGS[composition_mode]
+
+    if texture:
+        if cache is not None:
+            sprite = cache.get_texture(texture, size, color, composition_mode)
+        elif int(size[0]) > 0 and int(size[1]) > 0:
+            scaled = pygame.transform.scale(texture, (int(size[0]), int(size[1])))
+            sprite = SpriteCache.tint(scaled, color, composition_mode)
+        else:
+            sprite = None
+        if sprite is not None:
+            surface.blit(sprite, (x - int(size[0] / 2), y - int(size[1] / 2)), special_flags=flags)
+    elif cache is not None:
+        sprite = cache.get_shape(shape, size, color, composition_mode)
+        if sprite is not None:
+            width, height = sprite.get_size()
+            surface.blit(sprite, (x - width // 2, y - height // 2), special_flags=flags)
+    else:
+        if shape == 0:
+            radius = int(max(size[0], size[1]) / 2)
+            if radius > 0:
+                circle_surface = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+                pygame.draw.circle(circle_surface, color, (radius, radius), radius)
+                surface.blit(circle_surface, (x - radius, y - radius))
+        else:
+            rect_surface = pygame.Surface((int(size[0]), int(size[1])), pygame.SRCALPHA)
+            rect_surface.fill(color)
+            surface.blit(rect_surface, (x - int(size[0] / 2), y - int(size[1] / 2)))
@@ -1,9 +1,12 @@
 
 import math
+import numpy as np
 from typing import TYPE_CHECKING
+from particle_pool import ParticleView
 
 if TYPE_CHECKING:
     from particle import Particle
+    from particle_pool import ParticlePool
 
 class ParticleAffector:
     def __init__(self):
@@ -23,9 +26,27 @@ class ParticleAffector:
 
         self.elapsed_time += elapsed_time
 
+    def reset(self):
+        self.elapsed_time = 0.0
+        self.active = False
+        self.finished = False
+
+    def get_state(self) -> dict:
+        return {'elapsed_time': self.elapsed_time, 'active': self.active, 'finished': self.finished}
+
+    def set_state(self, state: dict):
+        self.elapsed_time = state['elapsed_time']
+        self.active = state['active']
+        self.finished = state['finished']
+
     def update_particle(self, particle: 'Particle', elapsed_time: float):
         pass
 
+    def update_particles(self, pool: 'ParticlePool', elapsed_time: float):
+        # Fallback para affectors que só implementam update_particle
+        for i in range(pool.count):
+            self.update_particle(ParticleView(pool, i), elapsed_time)
+
     def has_finished(self) -> bool:
         return self.finished
 
@@ -33,17 +54,30 @@ class ParticleAffector:
 class GravityAffector(ParticleAffector):
     def __init__(self, angle: float = 270.0, gravity: float = 9.8):
         super().__init__()
-        self.angle = math.radians(angle)
         self.gravity = gravity
+        self.set_angle(angle)
+
+    def set_angle(self, angle: float):
+        self.angle = math.radians(angle)
+        self.direction = (math.cos(self.angle), math.sin(self.angle))
 
     def update_particle(self, particle: 'Particle', elapsed_time: float):
         if not self.active:
             return
 
-        velocity = list(particle.get_velocity())
-        velocity[0] += self.gravity * elapsed_time * math.cos(self.angle)
-        velocity[1] += self.gravity * elapsed_time * math.sin(self.angle)
-        particle.set_velocity(tuple(velocity))
+        velocity = particle.get_velocity()
+        step = self.gravity * elapsed_time
+        particle.set_velocity((
+            velocity[0] + step * self.direction[0],
+            velocity[1] + step * self.direction[1]
+        ))
+
+    def update_particles(self, pool: 'ParticlePool', elapsed_time: float):
+        if not self.active or pool.count == 0:
+            return
+
+        step = self.gravity * elapsed_time
+        pool.velocity[:pool.count] += (step * self.direction[0], step * self.direction[1])
 
 
 class AttractionAffector(ParticleAffector):
@@ -78,3 +112,27 @@ class AttractionAffector(ParticleAffector):
         p_velocity[1] -= p_velocity[1] * self.reduction / 100.0 * elapsed_time
 
         particle.set_velocity(tuple(p_velocity))
+
+    def update_particles(self, pool: 'ParticlePool', elapsed_time: float):
+        n = pool.count
+        if not self.active or n == 0:
+            return
+
+        position = pool.position[:n]
+        delta = np.empty((n, 2))
+        delta[:, 0] = self.position[0] - position[:, 0]
+        delta[:, 1] = position[:, 1] - self.position[1]
+
+        length = np.hypot(delta[:, 0], delta[:, 1])
+        moving = length > 0
+
+        direction = -1.0 if self.repelish else 1.0
+        pull = np.zeros(n)
+        np.divide(self.acceleration * elapsed_time * direction, length, out=pull, where=moving)
+
+        velocity = pool.velocity[:n]
+        velocity += delta * pull[:, None]
+
+        # Redução de velocidade
+        if self.reduction:
+            velocity -= velocity * (moving * (self.reduction / 100.0 * elapsed_time))[:, None]
@@ -0,0 +1,134 @@
+from typing import List, Optional
+
+
+# Degraus de degradação, do menos para o mais visível
+LEVEL_FULL = 0
+LEVEL_THIN_EMISSION = 1
+LEVEL_SIMPLE_STAMPS = 2
+LEVEL_PARTIAL_AFFECTORS = 3
+
+LEVEL_NAMES = {
+    LEVEL_FULL: "completo",
+    LEVEL_THIN_EMISSION: "emissão reduzida",
+    LEVEL_SIMPLE_STAMPS: "stamps simples",
+    LEVEL_PARTIAL_AFFECTORS: "affectors parciais",
+}
+
+# Fração da emissão mantida a partir de LEVEL_THIN_EMISSION
+THINNED_EMISSION = 0.5
+# Em LEVEL_PARTIAL_AFFECTORS, partículas além desta fração da vida ficam sem affectors
+AFFECTOR_CUTOFF = 0.5
+
+
+class ParticleBudget:
+    """Limite de partículas vivas e orçamento de tempo por quadro, com degradação em degraus"""
+
+    def __init__(
+        self,
+        max_particles: Optional[int] = None,
+        frame_budget: Optional[float] = None,
+        escalate_frames: int = 3,
+        recover_frames: int = 60,
+        max_reports: int = 100
+    ):
+        self.max_particles = max_particles
+        self.frame_budget = frame_budget
+        self.escalate_frames = escalate_frames
+        self.recover_frames = recover_frames
+        self.max_reports = max_reports
+        self.reset()
+
+    def reset(self):
+        # Volta ao nível completo e zera contadores e relatórios, mantendo os limites
+        self.level = LEVEL_FULL
+        self.slow_frames = 0
+        self.calm_frames = 0
+        self.emission_credit = 0.0
+        self.capped = False
+
+        # Contadores do custo evitado: o que o efeito faria sem limites
+        self.requested_particles = 0
+        self.thinned_particles = 0
+        self.capped_particles = 0
+        self.simplified_renders = 0
+        self.skipped_affector_updates = 0
+
+        self.reports: List[str] = []
+        self.pending_reports: List[str] = []
+
+    def admit(self, live: int, requested: int) -> int:
+        # Quantas das 'requested' partículas pedidas pelo emissor podem nascer
+        self.requested_particles += requested
+        allowed = requested
+
+        if self.level >= LEVEL_THIN_EMISSION:
+            self.emission_credit += requested * THINNED_EMISSION
+            allowed = int(self.emission_credit)
+            self.emission_credit -= allowed
+            self.thinned_particles += requested - allowed
+
+        if self.max_particles is not None:
+            room = max(0, self.max_particles - live)
+            if allowed > room:
+                self.capped_particles += allowed - room
+                allowed = room
+                if not self.capped:
+                    self.report(f"limite de {self.max_particles} partículas vivas atingido")
+                self.capped = True
+            elif live < self.max_particles:
+                self.capped = False
+
+        return allowed
+
+    def record_frame(self, frame_time: float):
+        if self.frame_budget is None:
+            return
+
+        if frame_time > self.frame_budget:
+            self.calm_frames = 0
+            self.slow_frames += 1
+            if self.slow_frames >= self.escalate_frames and self.level < LEVEL_PARTIAL_AFFECTORS:
+                self.slow_frames = 0
+                self.set_level(self.level + 1, frame_time)
+            return
+
+        # Volta um degrau só depois de vários quadros com folga
+        self.slow_frames = 0
+        if self.level == LEVEL_FULL:
+            return
+        self.calm_frames = self.calm_frames + 1 if frame_time < self.frame_budget * 0.5 else 0
+        if self.calm_frames >= self.recover_frames:
+            self.calm_frames = 0
+            self.set_level(self.level - 1, frame_time)
+
+    def set_level(self, level: int, frame_time: float):
+        self.report(f"{LEVEL_NAMES[self.level]} -> {LEVEL_NAMES[level]} "
+                    f"({frame_time * 1000:.1f} ms, orçamento {self.frame_budget * 1000:.1f} ms)")
+        self.level = level
+
+    def affector_cutoff(self) -> Optional[float]:
+        return AFFECTOR_CUTOFF if self.level >= LEVEL_PARTIAL_AFFECTORS else None
+
+    def simplify_stamps(self) -> bool:
+        return self.level >= LEVEL_SIMPLE_STAMPS
+
+    def report(self, message: str):
+        self.reports.append(message)
+        self.pending_reports.append(message)
+        del self.reports[:-self.max_reports]
+
+    def take_reports(self) -> List[str]:
+        reports = self.pending_reports
+        self.pending_reports = []
+        return reports
+
+    def get_stats(self) -> dict:
+        return {
+            'level': self.level,
+            'level_name': LEVEL_NAMES[self.level],
+            'requested_particles': self.requested_particles,
+            'thinned_particles': self.thinned_particles,
+            'capped_particles': self.capped_particles,
+            'simplified_renders': self.simplified_renders,
+            'skipped_affector_updates': self.skipped_affector_updates,
+        }
@@ -1,15 +1,14 @@
 
 import math
-import random
-from typing import TYPE_CHECKING
+import numpy as np
+from typing import Optional, TYPE_CHECKING
 from particle_type import ParticleType
-from particle import Particle
 
 if TYPE_CHECKING:
     from particle_system import ParticleSystem
 
 class ParticleEmitter:
-    def __init__(self):
+    def __init__(self, seed: Optional[int] = None):
         self.position = (0, 0)
         self.duration = -1.0
         self.delay = 0.0
@@ -20,6 +19,36 @@ class ParticleEmitter:
         self.finished = False
         self.active = False
         self.particle_type: ParticleType = None
+        # Segundos simulados na criação para o efeito já surgir em regime
+        self.prewarm = 0.0
+        # Gerador próprio: um preset com a mesma semente se repete exatamente
+        self.rng = np.random.default_rng(seed)
+
+    def set_seed(self, seed):
+        self.rng = np.random.default_rng(seed)
+
+    def reset(self):
+        # Volta ao início mantendo configuração, tipo e gerador
+        self.elapsed_time = 0.0
+        self.current_burst = 0
+        self.finished = False
+        self.active = False
+
+    def get_state(self) -> dict:
+        return {
+            'elapsed_time': self.elapsed_time,
+            'current_burst': self.current_burst,
+            'active': self.active,
+            'finished': self.finished,
+            'rng': self.rng.bit_generator.state,
+        }
+
+    def set_state(self, state: dict):
+        self.elapsed_time = state['elapsed_time']
+        self.current_burst = state['current_burst']
+        self.active = state['active']
+        self.finished = state['finished']
+        self.rng.bit_generator.state = state['rng']
 
     def set_particle_type(self, particle_type: ParticleType):
         self.particle_type = particle_type
@@ -32,13 +61,52 @@ class ParticleEmitter:
 
     def set_delay(self, delay: float):
         self.delay = delay
+        self.rebase_bursts()
 
     def set_burst_rate(self, rate: float):
         self.burst_rate = rate
+        self.rebase_bursts()
+
+    def rebase_bursts(self):
+        # Ritmo ou atraso novos valem a partir de agora: sem rajada para
+        # "alcançar" a nova contagem, sem bursts dentro de um atraso novo
+        if self.elapsed_time <= self.delay:
+            # Atraso ainda por vir: volta a esperar e recomeça do primeiro burst
+            self.active = False
+            self.current_burst = 0
+        elif self.active or self.elapsed_time > 0:
+            # Rodando, ou atraso encurtado para antes de agora: os bursts até
+            # aqui contam como feitos e a emissão segue no ritmo a partir daqui
+            self.active = True
+            self.current_burst = int(math.floor((self.elapsed_time - self.delay) * self.burst_rate) + 1)
 
     def set_burst_count(self, count: int):
         self.burst_count = count
 
+    def set_prewarm(self, seconds: float):
+        self.prewarm = seconds
+
+    def get_particle_lifetime(self) -> float:
+        # Maior duração possível das partículas; negativa = sem fim
+        ptype = self.particle_type
+        if ptype is None:
+            return 0.0
+        if ptype.min_duration < 0 or ptype.max_duration < 0:
+            return -1.0
+        return max(ptype.min_duration, ptype.max_duration)
+
+    def skip(self, seconds: float):
+        # Avança o relógio sem emitir: os bursts desse trecho são dados como feitos
+        self.elapsed_time += seconds
+
+        if self.duration > 0 and self.elapsed_time >= self.duration + self.delay:
+            self.finished = True
+            return
+
+        if self.elapsed_time > self.delay:
+            self.active = True
+            self.current_burst = int(math.floor((self.elapsed_time - self.delay) * self.burst_rate) + 1)
+
     def update(self, elapsed_time: float, particle_system: 'ParticleSystem'):
         self.elapsed_time += elapsed_time
 
@@ -53,58 +121,57 @@ class ParticleEmitter:
             return
 
         next_burst = int(math.floor((self.elapsed_time - self.delay) * self.burst_rate) + 1)
-        ptype = self.particle_type
+        bursts = next_burst - self.current_burst
+        self.current_burst = next_burst
 
-        for b in range(self.current_burst, next_burst):
-    
-            p_radius = random.uniform(ptype.min_position_radius, ptype.max_position_radius)
-            p_angle = random.uniform(ptype.min_position_angle, ptype.max_position_angle)
-            p_position = (
-                self.position[0] + p_radius * math.cos(p_angle),
-                self.position[1] + p_radius * math.sin(p_angle)
-            )
-
-            for p in range(self.burst_count):
-                p_duration = random.uniform(ptype.min_duration, ptype.max_duration)
-
-           
-                p_velocity_abs = random.uniform(ptype.min_velocity, ptype.max_velocity)
-                p_velocity_angle = random.uniform(ptype.min_velocity_angle, ptype.max_velocity_angle)
-                p_velocity = (
-                    p_velocity_abs * math.cos(p_velocity_angle),
-                    p_velocity_abs * math.sin(p_velocity_angle)
-                )
-
-               
-                p_accel_abs = random.uniform(ptype.min_acceleration, ptype.max_acceleration)
-                p_accel_angle = random.uniform(ptype.min_acceleration_angle, ptype.max_acceleration_angle)
-                p_acceleration = (
-                    p_accel_abs * math.cos(p_accel_angle),
-                    p_accel_abs * math.sin(p_accel_angle)
-                )
-
-           
-                multiplier = random.uniform(ptype.random_size_multiplier[0], ptype.random_size_multiplier[1])
-                start_size = (int(ptype.start_size[0] * multiplier), int(ptype.start_size[1] * multiplier))
-                final_size = (int(ptype.final_size[0] * multiplier), int(ptype.final_size[1] * multiplier))
-
-                particle = Particle(
-                    p_position,
-                    start_size,
-                    final_size,
-                    p_velocity,
-                    p_acceleration,
-                    p_duration,
-                    ptype.ignore_physics_after,
-                    ptype.colors,
-                    ptype.colors_stops,
-                    ptype.texture,
-                    ptype.shape                    
-                )
-
-                particle_system.add_particle(particle)
+        if bursts <= 0 or self.burst_count <= 0:
+            return
 
-        self.current_burst = next_burst
+        # Todos os bursts do tick são sorteados de uma vez, em arrays
+        ptype = self.particle_type
+        count = bursts * self.burst_count
+
+        p_radius = self.uniform(ptype.min_position_radius, ptype.max_position_radius, bursts)
+        p_angle = self.uniform(ptype.min_position_angle, ptype.max_position_angle, bursts)
+        p_position = np.empty((bursts, 2))
+        p_position[:, 0] = self.position[0] + p_radius * np.cos(p_angle)
+        p_position[:, 1] = self.position[1] + p_radius * np.sin(p_angle)
+        p_position = np.repeat(p_position, self.burst_count, axis=0)
+
+        p_duration = self.uniform(ptype.min_duration, ptype.max_duration, count)
+
+        p_velocity = self.random_vectors(
+            ptype.min_velocity, ptype.max_velocity,
+            ptype.min_velocity_angle, ptype.max_velocity_angle, count
+        )
+        p_acceleration = self.random_vectors(
+            ptype.min_acceleration, ptype.max_acceleration,
+            ptype.min_acceleration_angle, ptype.max_acceleration_angle, count
+        )
+
+        multiplier = self.uniform(ptype.random_size_multiplier[0], ptype.random_size_multiplier[1], count)
+
+        particle_system.add_particles(
+            ptype,
+            p_position,
+            p_velocity,
+            p_acceleration,
+            p_duration,
+            multiplier
+        )
+
+    def uniform(self, low: float, high: float, count: int) -> np.ndarray:
+        # Como random.uniform, aceita low > high
+        return low + (high - low) * self.rng.random(count)
+
+    def random_vectors(self, min_abs: float, max_abs: float, min_angle: float, max_angle: float,
+                       count: int) -> np.ndarray:
+        magnitude = self.uniform(min_abs, max_abs, count)
+        angle = self.uniform(min_angle, max_angle, count)
+        vectors = np.empty((count, 2))
+        vectors[:, 0] = magnitude * np.cos(angle)
+        vectors[:, 1] = magnitude * np.sin(angle)
+        return vectors
 
     def has_finished(self) -> bool:
         return self.finished
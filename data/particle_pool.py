@@ -0,0 +1,274 @@
+import numpy as np
+from typing import List, Optional, Tuple, TYPE_CHECKING
+from particle_type import ParticleType, ParticleDescriptor, COLOR_LUT_SIZE
+
+if TYPE_CHECKING:
+    from particle import Particle
+    from particle_affector import ParticleAffector
+
+
+class ParticleView:
+    # Acesso por índice a uma partícula do pool, para affectors que só
+    # implementam update_particle
+    __slots__ = ('pool', 'index')
+
+    def __init__(self, pool: 'ParticlePool', index: int):
+        self.pool = pool
+        self.index = index
+
+    def get_position(self) -> Tuple[float, float]:
+        position = self.pool.position[self.index]
+        return (float(position[0]), float(position[1]))
+
+    def get_velocity(self) -> Tuple[float, float]:
+        velocity = self.pool.velocity[self.index]
+        return (float(velocity[0]), float(velocity[1]))
+
+    def set_position(self, position: Tuple[float, float]):
+        self.pool.position[self.index] = position
+
+    def set_velocity(self, velocity: Tuple[float, float]):
+        self.pool.velocity[self.index] = velocity
+
+    def has_finished(self) -> bool:
+        return False
+
+
+class ParticlePool:
+    """Armazena as partículas vivas em arrays NumPy contíguos (structure of arrays)"""
+
+    def __init__(self, capacity: int = 1024):
+        self.count = 0
+        self.capacity = 0
+
+        # Descritores dos tipos presentes no pool
+        self.looks: List[ParticleDescriptor] = []
+        self.look_ids = {}
+        self.look_luts = np.zeros((0, COLOR_LUT_SIZE, 4), dtype=np.uint8)
+
+        self.position = np.zeros((0, 2))
+        self.velocity = np.zeros((0, 2))
+        self.acceleration = np.zeros((0, 2))
+        self.start_size = np.zeros((0, 2))
+        self.final_size = np.zeros((0, 2))
+        self.size = np.zeros((0, 2))
+        self.elapsed_time = np.zeros(0)
+        self.duration = np.zeros(0)
+        self.ignore_physics_after = np.zeros(0)
+        self.color = np.zeros((0, 4), dtype=np.uint8)
+        self.look = np.zeros(0, dtype=np.int32)
+
+        self.reserve(capacity)
+
+    def _arrays(self) -> List[str]:
+        return ['position', 'velocity', 'acceleration', 'start_size', 'final_size', 'size',
+                'elapsed_time', 'duration', 'ignore_physics_after', 'color', 'look']
+
+    def reserve(self, capacity: int):
+        if capacity <= self.capacity:
+            return
+
+        for name in self._arrays():
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+
+        self.capacity = capacity
+
+    def clear(self):
+        # Esvazia sem realocar: os arrays ficam com a capacidade já reservada
+        self.count = 0
+        self.looks.clear()
+        self.look_ids.clear()
+        self.look_luts = self.look_luts[:0]
+
+    def get_state(self) -> dict:
+        # Cópia das partículas vivas; os looks só crescem e não entram no estado
+        return {name: getattr(self, name)[:self.count].copy() for name in self._arrays()}
+
+    def set_state(self, state: dict):
+        count = len(state['duration'])
+        self.reserve(count)
+        for name in self._arrays():
+            getattr(self, name)[:count] = state[name]
+        self.count = count
+
+    def get_look_id(self, descriptor: ParticleDescriptor) -> int:
+        look_id = self.look_ids.get(id(descriptor))
+        if look_id is None:
+            look_id = len(self.looks)
+            self.looks.append(descriptor)
+            self.look_ids[id(descriptor)] = look_id
+
+            # Tabelas empilhadas: cor = look_luts[look, índice da idade]
+            lut = np.array(descriptor.color_table, dtype=np.uint8).reshape(1, -1, 4)
+            if look_id == 0:
+                self.look_luts = lut
+            else:
+                self.look_luts = np.concatenate([self.look_luts, lut])
+        return look_id
+
+    def replace_look(self, old: ParticleDescriptor, new: ParticleDescriptor):
+        # As partículas vivas do look passam a usar o novo descritor e sua tabela de cores
+        look_id = self.look_ids.pop(id(old), None)
+        if look_id is None:
+            return
+        self.looks[look_id] = new
+        self.look_ids[id(new)] = look_id
+        self.look_luts[look_id] = np.array(new.color_table, dtype=np.uint8)
+
+        n = self.count
+        self.ignore_physics_after[:n][self.look[:n] == look_id] = new.ignore_physics_after
+
+    def add_particle(self, particle: 'Particle'):
+        if self.count >= self.capacity:
+            self.reserve(max(1024, self.capacity * 2))
+
+        i = self.count
+        descriptor = particle.descriptor
+        self.position[i] = particle.get_position()
+        self.velocity[i] = particle.get_velocity()
+        self.acceleration[i] = (particle.ax, particle.ay)
+        self.start_size[i] = particle.start_size
+        self.final_size[i] = particle.final_size
+        self.size[i] = particle.size
+        self.elapsed_time[i] = particle.elapsed_time
+        self.duration[i] = particle.duration
+        self.ignore_physics_after[i] = descriptor.ignore_physics_after
+        self.color[i] = particle.color
+        self.look[i] = self.get_look_id(descriptor)
+        self.count += 1
+
+    def add_particles(
+        self,
+        particle_type: ParticleType,
+        positions: np.ndarray,
+        velocities: np.ndarray,
+        accelerations: np.ndarray,
+        durations: np.ndarray,
+        size_multipliers: np.ndarray
+    ):
+        count = len(durations)
+        if count == 0:
+            return
+
+        if self.count + count > self.capacity:
+            self.reserve(max(1024, self.capacity * 2, self.count + count))
+
+        descriptor = particle_type.get_descriptor()
+        block = slice(self.count, self.count + count)
+        self.position[block] = positions
+        self.velocity[block] = velocities
+        self.acceleration[block] = accelerations
+        self.start_size[block] = np.trunc(np.outer(size_multipliers, descriptor.start_size))
+        self.final_size[block] = np.trunc(np.outer(size_multipliers, descriptor.final_size))
+        self.size[block] = self.start_size[block]
+        self.elapsed_time[block] = 0.0
+        self.duration[block] = durations
+        self.ignore_physics_after[block] = descriptor.ignore_physics_after
+        self.color[block] = descriptor.color_table[0]
+        self.look[block] = self.get_look_id(descriptor)
+        self.count += count
+
+    def remove_finished(self):
+        n = self.count
+        duration = self.duration[:n]
+        finished = (duration >= 0) & (self.elapsed_time[:n] >= duration)
+        dead = np.flatnonzero(finished)
+        if len(dead) == 0:
+            return
+
+        # Troca com o fim: as vagas abertas antes de 'kept' recebem as
+        # partículas vivas do fim do bloco, custo proporcional aos mortos
+        kept = n - len(dead)
+        holes = dead[dead < kept]
+        movers = np.flatnonzero(~finished[kept:]) + kept
+        if len(holes):
+            for name in self._arrays():
+                array = getattr(self, name)
+                array[holes] = array[movers]
+        self.count = kept
+
+    def apply_affectors(self, affectors: List['ParticleAffector'], elapsed_time: float,
+                        cutoff: Optional[float] = None) -> int:
+        # cutoff: fração da vida a partir da qual a partícula fica sem affectors.
+        # Retorna quantas partículas foram puladas
+        if not affectors:
+            return 0
+
+        n = self.count
+        skipped = 0
+        if cutoff is not None and n:
+            duration = self.duration[:n]
+            old = (duration > 0) & (self.elapsed_time[:n] >= duration * cutoff)
+            skipped = int(np.count_nonzero(old))
+
+        if skipped:
+            # As mais velhas vão para o fim e ficam fora de [:count] durante os
+            # affectors; a troca custa proporcional às que mudam de lado
+            kept = n - skipped
+            holes = np.flatnonzero(old[:kept])
+            movers = np.flatnonzero(~old[kept:]) + kept
+            for name in self._arrays():
+                array = getattr(self, name)
+                array[holes], array[movers] = array[movers], array[holes]
+            self.count = kept
+
+        try:
+            for affector in affectors:
+                affector.update_particles(self, elapsed_time)
+        finally:
+            self.count = n
+        return skipped
+
+    def update(self, elapsed_time: float):
+        n = self.count
+        if n == 0:
+            return
+
+        elapsed = self.elapsed_time[:n]
+        duration = self.duration[:n]
+
+        # Cor e tamanho pela idade normalizada (só para duração positiva)
+        timed = duration > 0
+        life = np.zeros(n)
+        np.divide(elapsed, duration, out=life, where=timed)
+        self.update_color(life, timed)
+
+        size = self.start_size[:n] + (self.final_size[:n] - self.start_size[:n]) * life[:, None]
+        self.size[:n] = np.where(timed[:, None], size, self.size[:n])
+
+        # Integração (y da tela é invertido)
+        ignore_after = self.ignore_physics_after[:n]
+        physics = (ignore_after < 0) | (elapsed < ignore_after)
+        step = physics[:, None] * elapsed_time
+        self.position[:n, 0] += self.velocity[:n, 0] * step[:, 0]
+        self.position[:n, 1] -= self.velocity[:n, 1] * step[:, 0]
+        self.velocity[:n] += self.acceleration[:n] * step
+
+        elapsed += elapsed_time
+
+    def update_color(self, life: np.ndarray, timed: np.ndarray):
+        n = self.count
+        last = self.look_luts.shape[1] - 1
+        index = np.clip((life * last).astype(np.intp), 0, last)
+        color = self.look_luts[self.look[:n], index]
+        self.color[:n] = np.where(timed[:, None], color, self.color[:n])
+
+    def get_extents(self) -> np.ndarray:
+        # (esquerda, topo, direita, base) de cada partícula viva. Meia largura
+        # pela maior dimensão: cobre círculo, retângulo e textura
+        n = self.count
+        position = self.position[:n]
+        half = self.size[:n].max(axis=1, initial=0)[:, None] / 2
+        return np.hstack([position - half, position + half])
+
+    def get_bounds(self) -> Optional[Tuple[float, float, float, float]]:
+        if self.count == 0:
+            return None
+
+        extents = self.get_extents()
+        left, top = extents[:, :2].min(axis=0)
+        right, bottom = extents[:, 2:].max(axis=0)
+        return (float(left), float(top), float(right), float(bottom))
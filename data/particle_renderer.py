@@ -0,0 +1,286 @@
+import numpy as np
+import pygame
+from typing import List, Optional, Tuple
+from sprite_cache import (
+    SpriteCache, BLEND_FLAGS, SHAPE_CIRCLE, SIMPLE_COLOR_STEP,
+    COMPOSITION_NORMAL, COMPOSITION_ADDITION, COMPOSITION_MULTIPLY
+)
+from particle_pool import ParticlePool
+from particle_type import ParticleDescriptor
+
+
+# Partículas com a maior dimensão até este tamanho (px) são compostas direto
+# no buffer da superfície em vez de virar um blit cada; 0 desliga. Acima de
+# 2 px o blit em lote volta a ser mais rápido (benchmarks/splat_benchmark.py)
+SPLAT_THRESHOLD = 2
+
+
+class ParticleRenderer:
+    """Desenha o pool em lote: agrupa por variante (look, tamanho, cor) e
+    faz um Surface.blits por modo de composição"""
+
+    def __init__(self, sprite_cache: SpriteCache, splat_threshold: int = SPLAT_THRESHOLD):
+        self.sprite_cache = sprite_cache
+        self.splat_threshold = splat_threshold
+        self.blit_calls = 0
+        self.variants = 0
+        self.splatted = 0
+        self.drawn = 0
+        self.culled = 0
+        self.texture_tints = {}
+        # Modo barato (orçamento estourado): texturas viram stamps e a cor é mais grossa
+        self.simplify = False
+
+    def look_traits(self, looks: List[ParticleDescriptor]) -> np.ndarray:
+        # (tem textura, forma, modo de composição) por look
+        return np.array([(d.texture is not None, d.shape, d.composition_mode) for d in looks],
+                        dtype=np.int32).reshape(-1, 3)
+
+    def look_tints(self, looks: List[ParticleDescriptor]) -> np.ndarray:
+        # Cor média da textura por look: num splat de poucos pixels ela vira só um fator
+        tints = np.ones((len(looks), 4), dtype=np.float32)
+        for look, descriptor in enumerate(looks):
+            texture = descriptor.texture
+            if texture is None or self.simplify:
+                continue
+            tint = self.texture_tints.get(texture)
+            if tint is None:
+                tint = np.array(pygame.transform.average_color(texture), dtype=np.float32) / 255
+                self.texture_tints[texture] = tint
+            tints[look] = tint
+        return tints
+
+    def quantize(self, pool: ParticlePool,
+                 viewport: Optional[pygame.Rect] = None) -> Tuple[np.ndarray, np.ndarray]:
+        # Mesmas regras de draw_particle/SpriteCache, em vetor
+        n = pool.count
+        cache = self.sprite_cache
+        looks = pool.look[:n]
+        size = pool.size[:n]
+        position = np.trunc(pool.position[:n]).astype(np.int32)
+
+        traits = self.look_traits(pool.looks)
+        textured = (traits[looks, 0] == 1) & (not self.simplify)
+        circle = (traits[looks, 1] == SHAPE_CIRCLE) & ~textured
+
+        width = size[:, 0].astype(np.int32)
+        height = size[:, 1].astype(np.int32)
+        offset = np.trunc(size / 2).astype(np.int32)
+
+        if cache.size_step > 1:
+            step = cache.size_step
+            width = np.where(textured, width // step * step, width)
+            height = np.where(textured, height // step * step, height)
+
+        # Círculo: raio da maior dimensão, centrado
+        radius = (np.maximum(size[:, 0], size[:, 1]) / 2).astype(np.int32)
+        width = np.where(circle, radius * 2, width)
+        height = np.where(circle, radius * 2, height)
+        offset = np.where(circle[:, None], radius[:, None], offset)
+
+        step = max(cache.color_step, SIMPLE_COLOR_STEP) if self.simplify else cache.color_step
+        color = np.minimum(255, (pool.color[:n].astype(np.int32) + step // 2) // step * step)
+
+        keys = np.empty((n, 7), dtype=np.int32)
+        keys[:, 0] = looks
+        keys[:, 1] = width
+        keys[:, 2] = height
+        keys[:, 3:] = color
+        dest = position - offset
+        visible = (width > 0) & (height > 0)
+
+        # Descarta quem está fora da área visível antes de qualquer sprite
+        if viewport is not None:
+            inside = ((dest[:, 0] < viewport.right) & (dest[:, 0] + width > viewport.left)
+                      & (dest[:, 1] < viewport.bottom) & (dest[:, 1] + height > viewport.top))
+            self.culled += int(np.count_nonzero(visible & ~inside))
+            visible &= inside
+        return keys[visible], dest[visible]
+
+    def get_sprite(self, look: int, width: int, height: int, color: Tuple[int, int, int, int],
+                   looks: List[ParticleDescriptor]) -> pygame.Surface:
+        descriptor = looks[look]
+        cache = self.sprite_cache
+        base = None if self.simplify else descriptor.texture
+        if base is None:
+            base = cache.get_stamp(descriptor.shape, (width, height))
+        return cache.get_variant(base, width, height, color, descriptor.composition_mode)
+
+    def can_splat(self, surface: pygame.Surface) -> bool:
+        return self.splat_threshold > 0 and surface.get_bytesize() == 4
+
+    def render_pool(self, surface: pygame.Surface, pool: ParticlePool,
+                    viewport: Optional[pygame.Rect] = None):
+        self.render_pools(surface, [pool], viewport)
+
+    def render_pools(self, surface: pygame.Surface, pools: List[ParticlePool],
+                     viewport: Optional[pygame.Rect] = None):
+        # Vários pools numa passada só: os looks de cada um ganham um
+        # deslocamento e as variantes/blits são agrupadas em conjunto
+        self.blit_calls = 0
+        self.variants = 0
+        self.splatted = 0
+        self.drawn = 0
+        self.culled = 0
+
+        # Sem viewport, corta pelo tamanho da superfície
+        clip = surface.get_rect()
+        viewport = clip if viewport is None else viewport.clip(clip)
+
+        looks: List[ParticleDescriptor] = []
+        all_keys = []
+        all_dest = []
+        for pool in pools:
+            if pool.count == 0:
+                continue
+            keys, dest = self.quantize(pool, viewport)
+            keys[:, 0] += len(looks)
+            looks.extend(pool.looks)
+            all_keys.append(keys)
+            all_dest.append(dest)
+
+        if not all_keys:
+            return
+        keys = np.concatenate(all_keys) if len(all_keys) > 1 else all_keys[0]
+        dest = np.concatenate(all_dest) if len(all_dest) > 1 else all_dest[0]
+        self.drawn = len(keys)
+        if len(keys) == 0:
+            return
+
+        if self.can_splat(surface):
+            tiny = np.maximum(keys[:, 1], keys[:, 2]) <= self.splat_threshold
+            if tiny.any():
+                large = ~tiny
+                self.blit_sprites(surface, looks, keys[large], dest[large])
+                self.splat(surface, looks, keys[tiny], dest[tiny])
+                return
+
+        self.blit_sprites(surface, looks, keys, dest)
+
+    def blit_sprites(self, surface: pygame.Surface, looks: List[ParticleDescriptor],
+                     keys: np.ndarray, dest: np.ndarray):
+        if len(keys) == 0:
+            return
+
+        # Cada linha vira um valor opaco: unique 1-D é bem mais barato que axis=0
+        rows = np.ascontiguousarray(keys).view(np.dtype((np.void, keys.itemsize * 7))).reshape(-1)
+        unique_rows, inverse = np.unique(rows, return_inverse=True)
+        variants = unique_rows.view(np.int32).reshape(-1, 7)
+        inverse = inverse.reshape(-1).tolist()
+        sprites: List[pygame.Surface] = []
+        for look, width, height, r, g, b, a in variants.tolist():
+            sprites.append(self.get_sprite(look, width, height, (r, g, b, a), looks))
+        self.variants = len(sprites)
+
+        # Ordem de desenho preservada dentro de cada modo
+        modes = self.look_traits(looks)[keys[:, 0], 2]
+        dest = dest.tolist()
+        for mode in np.unique(modes).tolist():
+            selected = np.flatnonzero(modes == mode).tolist()
+            flags = BLEND_FLAGS[mode]
+            if flags == 0:
+                sequence = [(sprites[inverse[i]], dest[i]) for i in selected]
+            else:
+                sequence = [(sprites[inverse[i]], dest[i], None, flags) for i in selected]
+            surface.blits(sequence, doreturn=False)
+            self.blit_calls += 1
+
+    @staticmethod
+    def overlap_layers(index: np.ndarray) -> List[np.ndarray]:
+        # Divide os fragmentos em camadas sem pixel repetido, na ordem original
+        order = np.argsort(index, kind='stable')
+        ordered = index[order]
+        starts = np.flatnonzero(np.r_[True, ordered[1:] != ordered[:-1]])
+        counts = np.diff(np.r_[starts, len(ordered)])
+        rank = np.arange(len(order)) - np.repeat(starts, counts)
+
+        by_rank = np.argsort(rank, kind='stable')
+        bounds = np.searchsorted(rank[by_rank], np.arange(rank.max() + 2))
+        ranked = order[by_rank]
+        return [ranked[bounds[i]:bounds[i + 1]] for i in range(len(bounds) - 1)]
+
+    def splat(self, surface: pygame.Surface, looks: List[ParticleDescriptor],
+              keys: np.ndarray, dest: np.ndarray):
+        # Um fragmento por pixel coberto; a pegada é a caixa (largura x altura)
+        # do sprite equivalente, o que para 1-4 px é indistinguível da forma
+        width = keys[:, 1]
+        height = keys[:, 2]
+        span = int(max(width.max(), height.max()))
+        dx, dy = np.meshgrid(np.arange(span), np.arange(span), indexing='ij')
+        dx = dx.reshape(-1)
+        dy = dy.reshape(-1)
+        inside = (dx[None, :] < width[:, None]) & (dy[None, :] < height[:, None])
+        particle, offset = np.nonzero(inside)
+
+        surface_width, surface_height = surface.get_size()
+        x = dest[particle, 0] + dx[offset]
+        y = dest[particle, 1] + dy[offset]
+        onscreen = (x >= 0) & (x < surface_width) & (y >= 0) & (y < surface_height)
+        particle = particle[onscreen]
+        if len(particle) == 0:
+            return
+
+        # Cor, alfa e modo por partícula; os fragmentos só indexam
+        look = keys[:, 0]
+        color = keys[:, 3:].astype(np.float32) * self.look_tints(looks)[look]
+        alpha = color[:, 3] / 255
+        rgb = color[:, :3]
+        modes = self.look_traits(looks)[look, 2][particle]
+
+        pixels, inverse = np.unique(x[onscreen] * surface_height + y[onscreen], return_inverse=True)
+        inverse = inverse.reshape(-1)
+        px = pixels // surface_height
+        py = pixels % surface_height
+
+        # Pixels de 32 bits lidos e gravados de uma vez; canais pelos deslocamentos do formato
+        target = pygame.surfarray.pixels2d(surface)
+        packed = target[px, py]
+        # Com canal alfa (SRCALPHA) ele entra como quarto canal acumulado
+        shifts = surface.get_shifts()[:4 if surface.get_flags() & pygame.SRCALPHA else 3]
+        accumulated = np.empty((len(pixels), len(shifts)), dtype=np.float32)
+        for channel, shift in enumerate(shifts):
+            accumulated[:, channel] = (packed >> shift) & 0xff
+        coverage = accumulated[:, 3:]
+
+        # Normal: alfa sobre o destino, em camadas (n-ésimo fragmento de cada
+        # pixel) para manter a ordem de desenho nas sobreposições
+        normal = np.flatnonzero(modes == COMPOSITION_NORMAL)
+        if len(normal):
+            for layer in self.overlap_layers(inverse[normal]):
+                fragment = normal[layer]
+                index = inverse[fragment]
+                source = particle[fragment]
+                a = alpha[source, None]
+                if coverage.shape[1]:
+                    # Como o blit em superfície com alfa: sobre pixel transparente
+                    # a cor é a da fonte e o alfa vira a + a_d * (1 - a)
+                    below = coverage[index]
+                    blend = np.where(below > 0, a, 1)
+                    accumulated[index, :3] = accumulated[index, :3] * (1 - blend) + rgb[source] * blend
+                    accumulated[index, 3:] = below + (255 - below) * a
+                else:
+                    accumulated[index] = accumulated[index] * (1 - a) + rgb[source] * a
+
+        # Soma: destino += cor * alfa, acumulada por pixel
+        addition = modes == COMPOSITION_ADDITION
+        if addition.any():
+            index = inverse[addition]
+            weighted = (rgb * alpha[:, None])[particle[addition]]
+            for channel in range(3):
+                accumulated[:, channel] += np.bincount(index, weighted[:, channel], minlength=len(pixels))
+
+        # Multiplicação: destino *= lerp(branco, cor, alfa)
+        multiply = modes == COMPOSITION_MULTIPLY
+        if multiply.any():
+            factor = np.ones_like(accumulated[:, :3])
+            np.multiply.at(factor, inverse[multiply],
+                           (1 - alpha[:, None] * (1 - rgb / 255))[particle[multiply]])
+            accumulated[:, :3] *= factor
+
+        channels = np.clip(accumulated + 0.5, 0, 255).astype(packed.dtype)
+        for channel, shift in enumerate(shifts):
+            packed &= ~packed.dtype.type(0xff << shift)
+            packed |= channels[:, channel] << packed.dtype.type(shift)
+        target[px, py] = packed
+        del target
+        self.splatted = len(keys)
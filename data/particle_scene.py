@@ -0,0 +1,95 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+import numpy as np
+import pygame
+from otps_loader import load_otps_system
+from particle_system import ParticleSystem
+from particle_renderer import ParticleRenderer
+from sprite_cache import SpriteCache, DEFAULT_SPRITE_CACHE
+
+
+class ParticleScene:
+    """Vários ParticleSystems independentes (efeitos presos a criaturas/tiles),
+    atualizados em paralelo e desenhados numa única passada"""
+
+    def __init__(self, workers: Optional[int] = None, sprite_cache: Optional[SpriteCache] = None):
+        self.systems: List[ParticleSystem] = []
+        # Threads: os kernels NumPy de cada sistema liberam o GIL; workers=0 atualiza em série
+        self.workers = workers
+        self.executor = ThreadPoolExecutor(workers) if workers != 0 else None
+        self.renderer = ParticleRenderer(sprite_cache if sprite_cache is not None else DEFAULT_SPRITE_CACHE)
+        self.drawn_count = 0
+        self.culled_count = 0
+
+    def add_system(self, particle_system: ParticleSystem):
+        self.systems.append(particle_system)
+
+    def add_effect(self, filepath: str, position: Tuple[float, float],
+                   seed: Optional[int] = None) -> Optional[ParticleSystem]:
+        particle_system = load_otps_system(filepath, position, seed=seed)
+        if particle_system is not None:
+            self.add_system(particle_system)
+        return particle_system
+
+    def run(self, function, systems: List[ParticleSystem]):
+        if self.executor is None or len(systems) < 2:
+            for particle_system in systems:
+                function(particle_system)
+            return
+        # list() propaga exceções dos workers
+        list(self.executor.map(function, systems))
+
+    def update(self):
+        # Cada sistema avança pelo próprio relógio
+        self.run(ParticleSystem.update, self.systems)
+        self.remove_finished()
+
+    def step(self, elapsed_time: float):
+        self.run(lambda particle_system: particle_system.step(elapsed_time), self.systems)
+        self.remove_finished()
+
+    def remove_finished(self):
+        systems = self.systems
+        alive = 0
+        for particle_system in systems:
+            if particle_system.has_finished() or (
+                    not particle_system.emitters and particle_system.get_particle_count() == 0):
+                continue
+            systems[alive] = particle_system
+            alive += 1
+        del systems[alive:]
+
+    def render(self, surface: pygame.Surface, viewport: Optional[pygame.Rect] = None):
+        for particle_system in self.systems:
+            particle_system.evaluate()
+        pools = [particle_system.pool for particle_system in self.systems if particle_system.pool is not None]
+        self.renderer.render_pools(surface, pools, viewport)
+        self.drawn_count = self.renderer.drawn
+        self.culled_count = self.renderer.culled
+
+        # Sistemas em lista não têm arrays para juntar: desenho individual
+        for particle_system in self.systems:
+            if particle_system.pool is None:
+                particle_system.render(surface, viewport)
+                self.drawn_count += particle_system.drawn_count
+                self.culled_count += particle_system.culled_count
+
+    def get_bounds(self) -> Optional[Tuple[float, float, float, float]]:
+        bounds = [b for b in (s.get_bounds() for s in self.systems) if b is not None]
+        if not bounds:
+            return None
+        return (min(b[0] for b in bounds), min(b[1] for b in bounds),
+                max(b[2] for b in bounds), max(b[3] for b in bounds))
+
+    def get_extents(self) -> np.ndarray:
+        return np.concatenate([np.zeros((0, 4))] + [s.get_extents() for s in self.systems])
+
+    def get_particle_count(self) -> int:
+        return sum(particle_system.get_particle_count() for particle_system in self.systems)
+
+    def clear(self):
+        self.systems.clear()
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown()
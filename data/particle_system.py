@@ -1,76 +1,543 @@
 
-import time
+import copy
 import math
-from typing import List
+import time
+import numpy as np
+from typing import Callable, List, Optional, Tuple
 from particle import Particle
+from particle_type import ParticleType, ParticleDescriptor
 from particle_emitter import ParticleEmitter
 from particle_affector import ParticleAffector
+from particle_pool import ParticlePool
+from particle_renderer import ParticleRenderer
+from particle_budget import ParticleBudget
+from spawn_records import SpawnRecords
+from sprite_cache import SpriteCache, DEFAULT_SPRITE_CACHE
 import pygame
 
+# Passo fixo da simulação e limite de passos de recuperação por update()
+STEP_SIZE = 0.0166
+MAX_SUBSTEPS = 5
+
 class ParticleSystem:
-    def __init__(self):
+    def __init__(
+        self,
+        use_pool: bool = False,
+        clock: Callable[[], float] = time.monotonic,
+        step_size: float = STEP_SIZE,
+        max_substeps: Optional[int] = MAX_SUBSTEPS,
+        sprite_cache: Optional[SpriteCache] = None,
+        budget: Optional[ParticleBudget] = None,
+        closed_form: bool = False
+    ):
         self.particles: List[Particle] = []
+        # Pool opcional com o estado das partículas em arrays NumPy
+        self.pool = ParticlePool() if use_pool or closed_form else None
         self.emitters: List[ParticleEmitter] = []
         self.affectors: List[ParticleAffector] = []
+        # Todos os já adicionados: as listas acima perdem os que terminam
+        self.added_emitters: List[ParticleEmitter] = []
+        self.added_affectors: List[ParticleAffector] = []
         self.finished = False
-        self.last_update_time = time.time()
+        self.spawned_count = 0
+
+        self.clock = clock
+        self.step_size = step_size
+        self.max_substeps = max_substeps
+        self.elapsed_time = 0.0
+        self.accumulated_time = 0.0
+        self.dropped_time = 0.0
+        self.last_update_time = clock()
+
+        self.sprite_cache = sprite_cache if sprite_cache is not None else DEFAULT_SPRITE_CACHE
+        self.renderer = ParticleRenderer(self.sprite_cache)
+        # Contagens do último render (desenhadas / fora da área visível)
+        self.drawn_count = 0
+        self.culled_count = 0
+
+        # Limite opcional de partículas vivas e de tempo por quadro (update + render)
+        self.budget = budget
+        self.frame_time = 0.0
+
+        # Se for um dict, step() soma nele o tempo de cada fase (benchmarks)
+        self.phase_times: Optional[dict] = None
+
+        # Último prewarm: segundos simulados e quanto custou
+        self.prewarmed = 0.0
+        self.prewarm_time = 0.0
+
+        # Forma fechada (só sem affectors): guarda os nascimentos e o pool é
+        # preenchido sob demanda para o passo atual, permitindo seek em O(n)
+        self.records = SpawnRecords() if closed_form else None
+        self.step_index = 0
+        self.emitted_steps = 0
+        self.evaluated_step = -1
+        self.record_step: Optional[float] = None
 
     def add_emitter(self, emitter: ParticleEmitter):
         self.emitters.append(emitter)
+        self.added_emitters.append(emitter)
+
+    def set_seed(self, seed: int):
+        # Um fluxo independente por emissor, derivado da semente do sistema
+        seeds = np.random.SeedSequence(seed).spawn(len(self.emitters))
+        for emitter, emitter_seed in zip(self.emitters, seeds):
+            emitter.set_seed(emitter_seed)
 
     def add_affector(self, affector: ParticleAffector):
+        if self.records is not None:
+            raise ValueError("affectors não são suportados no modo de forma fechada")
         self.affectors.append(affector)
+        self.added_affectors.append(affector)
+
+    def remove_affector(self, affector: ParticleAffector):
+        if affector in self.affectors:
+            self.affectors.remove(affector)
+        if affector in self.added_affectors:
+            self.added_affectors.remove(affector)
+
+    def replace_descriptor(self, old: ParticleDescriptor, new: ParticleDescriptor):
+        """Troca o visual de um tipo sem descartar as partículas vivas"""
+        if self.pool is not None:
+            self.pool.replace_look(old, new)
+            self.evaluated_step = -1
+        for particle in self.particles:
+            if particle.descriptor is old:
+                particle.descriptor = new
+
+    def clear_emitters(self):
+        self.emitters.clear()
+        self.added_emitters.clear()
+
+    def clear_affectors(self):
+        self.affectors.clear()
+        self.added_affectors.clear()
+
+    def reset(self):
+        """Volta ao estado de recém-criado sem realocar: partículas esvaziadas
+        no lugar, emissores e affectors reiniciados"""
+        self.particles.clear()
+        if self.pool is not None:
+            self.pool.clear()
+        if self.records is not None:
+            self.records.clear()
+        if self.budget is not None:
+            self.budget.reset()
+
+        self.emitters[:] = self.added_emitters
+        for emitter in self.emitters:
+            emitter.reset()
+        self.affectors[:] = self.added_affectors
+        for affector in self.affectors:
+            affector.reset()
+
+        self.finished = False
+        self.spawned_count = 0
+        self.elapsed_time = 0.0
+        self.accumulated_time = 0.0
+        self.dropped_time = 0.0
+        self.last_update_time = self.clock()
+        self.drawn_count = 0
+        self.culled_count = 0
+        self.frame_time = 0.0
+        self.prewarmed = 0.0
+        self.prewarm_time = 0.0
+        self.step_index = 0
+        self.emitted_steps = 0
+        self.evaluated_step = -1
+        self.record_step = None
+
+    def get_live_count(self) -> int:
+        # Na forma fechada, a contagem da última avaliação basta para o orçamento
+        if self.records is not None:
+            return self.pool.count
+        return self.get_particle_count()
 
     def add_particle(self, particle: Particle):
-        self.particles.append(particle)
+        if self.budget is not None and self.budget.admit(self.get_live_count(), 1) == 0:
+            return
 
-    def update(self):
-        delay = 0.0166  
+        self.spawned_count += 1
+        if self.records is not None:
+            descriptor = particle.descriptor
+            self.records.add(self.step_index, self.pool.get_look_id(descriptor),
+                             np.array([particle.get_position()]), np.array([particle.get_velocity()]),
+                             np.array([(particle.ax, particle.ay)]), np.array([particle.duration]),
+                             np.array([particle.start_size]), np.array([particle.final_size]),
+                             descriptor.ignore_physics_after)
+            self.evaluated_step = -1
+        elif self.pool is not None:
+            self.pool.add_particle(particle)
+        else:
+            self.particles.append(particle)
 
-        current_time = time.time()
-        elapsed_time = current_time - self.last_update_time
+    def add_particles(
+        self,
+        particle_type: ParticleType,
+        positions: np.ndarray,
+        velocities: np.ndarray,
+        accelerations: np.ndarray,
+        durations: np.ndarray,
+        size_multipliers: np.ndarray
+    ):
+        if self.budget is not None:
+            allowed = self.budget.admit(self.get_live_count(), len(durations))
+            if allowed < len(durations):
+                positions = positions[:allowed]
+                velocities = velocities[:allowed]
+                accelerations = accelerations[:allowed]
+                durations = durations[:allowed]
+                size_multipliers = size_multipliers[:allowed]
 
-        if elapsed_time < delay:
+        self.spawned_count += len(durations)
+        if self.records is not None:
+            descriptor = particle_type.get_descriptor()
+            self.records.add(self.step_index, self.pool.get_look_id(descriptor),
+                             positions, velocities, accelerations, durations,
+                             np.trunc(np.outer(size_multipliers, descriptor.start_size)),
+                             np.trunc(np.outer(size_multipliers, descriptor.final_size)),
+                             descriptor.ignore_physics_after)
+            self.evaluated_step = -1
             return
 
-        if not self.particles and not self.emitters:
-            self.finished = True
+        if self.pool is not None:
+            self.pool.add_particles(particle_type, positions, velocities, accelerations,
+                                    durations, size_multipliers)
             return
 
-        self.last_update_time = current_time - (elapsed_time % delay)
+        descriptor = particle_type.get_descriptor()
+        positions = positions.tolist()
+        velocities = velocities.tolist()
+        accelerations = accelerations.tolist()
+        durations = durations.tolist()
+        size_multipliers = size_multipliers.tolist()
+        for i in range(len(durations)):
+            self.particles.append(Particle(
+                descriptor,
+                positions[i],
+                velocities[i],
+                accelerations[i],
+                durations[i],
+                size_multipliers[i]
+            ))
+
+    def update(self):
+        # Avança pelo relógio; depois de um travamento (ex.: diálogo modal)
+        # o atraso além de max_substeps passos é descartado
+        current_time = self.clock()
+        elapsed_time = current_time - self.last_update_time
+        self.last_update_time = current_time
+
+        # Um quadro = update + render; o anterior é avaliado pelo orçamento
+        if self.budget is not None:
+            self.budget.record_frame(self.frame_time)
+        self.frame_time = 0.0
+
+        start = time.perf_counter()
+        self.advance(elapsed_time, self.max_substeps)
+        self.frame_time += time.perf_counter() - start
+
+    def advance(self, seconds: float, max_substeps: Optional[int] = None) -> int:
+        self.accumulated_time += seconds
 
-        iterations = int(math.floor(elapsed_time / delay))
+        if self.accumulated_time < self.step_size:
+            return 0
+
+        if not self.emitters and self.get_particle_count() == 0:
+            self.finished = True
+            return 0
+
+        iterations = int(self.accumulated_time // self.step_size)
+        if max_substeps is not None and iterations > max_substeps:
+            dropped = (iterations - max_substeps) * self.step_size
+            self.dropped_time += dropped
+            self.accumulated_time -= dropped
+            iterations = max_substeps
 
         for i in range(iterations):
-  
-            for emitter in self.emitters[:]:
-                if emitter.has_finished():
-                    self.emitters.remove(emitter)
-                else:
-                    emitter.update(delay, self)
-
-      
-            for affector in self.affectors[:]:
-                if affector.has_finished():
-                    self.affectors.remove(affector)
-                else:
-                    affector.update(delay)
-
-       
-            for particle in self.particles[:]:
-                if particle.has_finished():
-                    self.particles.remove(particle)
-                else:
-                    for affector in self.affectors:
-                        affector.update_particle(particle, delay)
-                    particle.update(delay)
-
-    def render(self, surface: pygame.Surface):
+            self.step(self.step_size)
+        self.accumulated_time -= iterations * self.step_size
+        return iterations
+
+    def step(self, elapsed_time: float):
+        if self.records is not None:
+            self.step_closed_form(elapsed_time)
+            return
+
+        self.elapsed_time += elapsed_time
+        timings = self.phase_times
+        if timings is None:
+            self.update_emitters(elapsed_time)
+            self.remove_finished_particles()
+            self.update_affectors(elapsed_time)
+            self.update_particles(elapsed_time)
+            return
+
+        clock = time.perf_counter
+        start = clock()
+        self.update_emitters(elapsed_time)
+        emitted = clock()
+        self.remove_finished_particles()
+        reclaimed = clock()
+        self.update_affectors(elapsed_time)
+        affected = clock()
+        self.update_particles(elapsed_time)
+        integrated = clock()
+
+        timings['emission'] = timings.get('emission', 0.0) + emitted - start
+        timings['reclaim'] = timings.get('reclaim', 0.0) + reclaimed - emitted
+        timings['affectors'] = timings.get('affectors', 0.0) + affected - reclaimed
+        timings['integration'] = timings.get('integration', 0.0) + integrated - affected
+
+    def step_closed_form(self, elapsed_time: float):
+        # A forma fechada conta passos inteiros: o dt precisa ser sempre o mesmo
+        if self.record_step is None:
+            self.record_step = elapsed_time
+        elif abs(elapsed_time - self.record_step) > 1e-9:
+            raise ValueError(f"passo {elapsed_time} diferente do passo fixo {self.record_step} da forma fechada")
+
+        self.step_index += 1
+        self.elapsed_time = self.step_index * self.record_step
+        # Depois de um seek para trás os nascimentos já estão gravados
+        if self.step_index > self.emitted_steps:
+            self.update_emitters(elapsed_time)
+            self.emitted_steps = self.step_index
+
+    def seek(self, time: float):
+        """Posiciona um sistema de forma fechada no instante 'time' (s)"""
+        if self.records is None:
+            raise ValueError("seek só é suportado no modo de forma fechada")
+
+        dt = self.record_step if self.record_step is not None else self.step_size
+        self.record_step = dt
+        target = max(0, int(round(time / dt)))
+        # Só os emissores andam até o alvo; as partículas saem da avaliação
+        while self.emitted_steps < target and self.emitters:
+            self.step_index = self.emitted_steps
+            self.step_closed_form(dt)
+        self.step_index = target
+        self.elapsed_time = target * dt
+
+    def evaluate(self):
+        # Preenche o pool com o estado do passo atual; no modo normal não faz nada
+        if self.records is None or self.evaluated_step == self.step_index:
+            return
+        self.records.evaluate(self.step_index, self.record_step or self.step_size, self.pool)
+        self.evaluated_step = self.step_index
+
+    # As listas são compactadas no lugar: cada item removido custa O(1),
+    # sem cópia da lista nem list.remove
+
+    def update_emitters(self, elapsed_time: float):
+        emitters = self.emitters
+        alive = 0
+        for emitter in emitters:
+            if emitter.has_finished():
+                continue
+            emitter.update(elapsed_time, self)
+            emitters[alive] = emitter
+            alive += 1
+        del emitters[alive:]
+
+    def update_affectors(self, elapsed_time: float):
+        affectors = self.affectors
+        alive = 0
+        for affector in affectors:
+            if affector.has_finished():
+                continue
+            affector.update(elapsed_time)
+            affectors[alive] = affector
+            alive += 1
+        del affectors[alive:]
+
+        if self.pool is not None:
+            cutoff = self.budget.affector_cutoff() if self.budget is not None else None
+            skipped = self.pool.apply_affectors(affectors, elapsed_time, cutoff)
+            if skipped:
+                self.budget.skipped_affector_updates += skipped * len(affectors)
+
+    def remove_finished_particles(self):
+        # Na lista a remoção acontece no próprio laço de update_particles
+        if self.pool is not None:
+            self.pool.remove_finished()
+
+    def update_particles(self, elapsed_time: float):
+        if self.pool is not None:
+            self.pool.update(elapsed_time)
+            return
+
+        particles = self.particles
+        affectors = self.affectors
+        cutoff = self.budget.affector_cutoff() if self.budget is not None else None
+        alive = 0
+        skipped = 0
+        for particle in particles:
+            # Sai no mesmo passo que no pool (idade >= duração), antes dos affectors;
+            # marcada como terminada ela não seria mais desenhada, só contada
+            if particle.has_finished() or 0 <= particle.duration <= particle.elapsed_time:
+                continue
+            if cutoff is not None and 0 < particle.duration * cutoff <= particle.elapsed_time:
+                skipped += len(affectors)
+            else:
+                for affector in affectors:
+                    affector.update_particle(particle, elapsed_time)
+            particle.update(elapsed_time)
+            particles[alive] = particle
+            alive += 1
+        del particles[alive:]
+        if skipped:
+            self.budget.skipped_affector_updates += skipped
+
+    def render(self, surface: pygame.Surface, viewport: Optional[pygame.Rect] = None):
+        # viewport: área visível da prévia; o resto não é desenhado
+        start = time.perf_counter()
+        self.evaluate()
+        simplify = self.budget is not None and self.budget.simplify_stamps()
+        if simplify:
+            self.budget.simplified_renders += 1
+        if self.pool is not None:
+            self.renderer.simplify = simplify
+            self.renderer.render_pool(surface, self.pool, viewport)
+            self.drawn_count = self.renderer.drawn
+            self.culled_count = self.renderer.culled
+            self.frame_time += time.perf_counter() - start
+            return
+
+        clip = surface.get_rect()
+        viewport = clip if viewport is None else viewport.clip(clip)
+        drawn = 0
+        for particle in self.particles:
+            x, y = particle.get_position()
+            half = max(particle.size) / 2
+            if (x + half < viewport.left or x - half >= viewport.right
+                    or y + half < viewport.top or y - half >= viewport.bottom):
+                continue
+            particle.render(surface, self.sprite_cache, simplify)
+            drawn += 1
+        self.drawn_count = drawn
+        self.culled_count = len(self.particles) - drawn
+        self.frame_time += time.perf_counter() - start
+
+    def get_bounds(self) -> Optional[Tuple[float, float, float, float]]:
+        # (esquerda, topo, direita, base) das partículas vivas, ou None
+        self.evaluate()
+        if self.pool is not None:
+            return self.pool.get_bounds()
+
+        if not self.particles:
+            return None
+        left = top = float('inf')
+        right = bottom = float('-inf')
         for particle in self.particles:
-            particle.render(surface)
+            x, y = particle.get_position()
+            half = max(particle.size) / 2
+            left = min(left, x - half)
+            top = min(top, y - half)
+            right = max(right, x + half)
+            bottom = max(bottom, y + half)
+        return (left, top, right, bottom)
+
+    def get_extents(self) -> np.ndarray:
+        # Caixa de cada partícula viva, (n, 4) na ordem de get_bounds
+        self.evaluate()
+        if self.pool is not None:
+            return self.pool.get_extents()
+
+        extents = np.empty((len(self.particles), 4))
+        for i, particle in enumerate(self.particles):
+            x, y = particle.get_position()
+            half = max(particle.size) / 2
+            extents[i] = (x - half, y - half, x + half, y + half)
+        return extents
+
+    def prewarm(self, seconds: Optional[float] = None):
+        """Leva o sistema recém-criado ao instante 'seconds' (padrão: o maior
+        prewarm dos emissores) sem simular os trechos que não deixam partículas vivas"""
+        if seconds is None:
+            seconds = max((emitter.prewarm for emitter in self.emitters), default=0.0)
+        if seconds <= 0:
+            return
+
+        start = time.perf_counter()
+        dt = self.record_step if self.record_step is not None else self.step_size
+        steps = int(round(seconds / dt))
+
+        # Só as partículas nascidas na última vida ainda existem no fim: antes
+        # disso emissores e affectors apenas avançam o relógio
+        lifetimes = [emitter.get_particle_lifetime() for emitter in self.emitters]
+        skipped = 0
+        if lifetimes and min(lifetimes) >= 0 and self.get_particle_count() == 0:
+            skipped = max(0, steps - int(math.ceil(max(lifetimes) / dt)) - 1)
+        if skipped:
+            skip_time = skipped * dt
+            for emitter in self.emitters:
+                emitter.skip(skip_time)
+            for affector in self.affectors:
+                affector.update(skip_time)
+            self.elapsed_time += skip_time
+            if self.records is not None:
+                self.step_index += skipped
+                self.emitted_steps = self.step_index
+
+        if self.records is not None:
+            # Forma fechada: só os emissores andam; as partículas saem da avaliação
+            self.seek(steps * dt)
+        else:
+            for i in range(steps - skipped):
+                self.step(dt)
+
+        self.prewarmed = steps * dt
+        self.prewarm_time = time.perf_counter() - start
+
+    def get_state(self) -> dict:
+        """Estado completo da simulação: partículas, emissores, affectors e relógio"""
+        state = {
+            'elapsed_time': self.elapsed_time,
+            'spawned_count': self.spawned_count,
+            'finished': self.finished,
+            # Emissores e affectors terminados saem das listas: guarda quem estava nelas
+            'emitters': [(emitter, emitter.get_state()) for emitter in self.emitters],
+            'affectors': [(affector, affector.get_state()) for affector in self.affectors],
+        }
+        if self.records is not None:
+            state['records'] = self.records.count
+            state['step_index'] = self.step_index
+            state['emitted_steps'] = self.emitted_steps
+        elif self.pool is not None:
+            state['pool'] = self.pool.get_state()
+        else:
+            state['particles'] = [copy.copy(particle) for particle in self.particles]
+        return state
+
+    def set_state(self, state: dict):
+        self.elapsed_time = state['elapsed_time']
+        self.spawned_count = state['spawned_count']
+        self.finished = state['finished']
+        self.accumulated_time = 0.0
+
+        self.emitters = [emitter for emitter, _ in state['emitters']]
+        for emitter, emitter_state in state['emitters']:
+            emitter.set_state(emitter_state)
+        self.affectors = [affector for affector, _ in state['affectors']]
+        for affector, affector_state in state['affectors']:
+            affector.set_state(affector_state)
+
+        if self.records is not None:
+            # Registros só crescem: voltar é descartar os nascidos depois
+            self.records.count = state['records']
+            self.step_index = state['step_index']
+            self.emitted_steps = state['emitted_steps']
+            self.evaluated_step = -1
+        elif self.pool is not None:
+            self.pool.set_state(state['pool'])
+        else:
+            self.particles = [copy.copy(particle) for particle in state['particles']]
 
     def has_finished(self) -> bool:
         return self.finished
 
     def get_particle_count(self) -> int:
+        self.evaluate()
+        if self.pool is not None:
+            return self.pool.count
         return len(self.particles)
@@ -1,9 +1,24 @@
 
 import random
 import math
-from typing import List, Tuple, Optional
+import numpy as np
+from typing import List, NamedTuple, Tuple, Optional
 import pygame
 
+# Resolução do degradê de cores pré-calculado por tipo
+COLOR_LUT_SIZE = 256
+
+class ParticleDescriptor(NamedTuple):
+    # Dados imutáveis compartilhados por todas as partículas de um tipo
+    start_size: Tuple[int, int]
+    final_size: Tuple[int, int]
+    ignore_physics_after: float
+    color_table: Tuple[Tuple[int, int, int, int], ...]
+    texture: Optional[pygame.Surface]
+    shape: int
+    composition_mode: int
+
+
 class ParticleType:
     def __init__(self, name: str = "default"):
         self.name = name
@@ -18,6 +33,7 @@ class ParticleType:
         self.final_size = (32, 32)
         self.random_size_multiplier = (1.0, 1.0)
         self.shape = 0
+        self.composition_mode = 0  # 0=normal, 1=addition, 2=multiply
      
         self.min_position_radius = 0.0
         self.max_position_radius = 3.0
@@ -41,9 +57,32 @@ class ParticleType:
         self.max_duration = 10.0
         self.ignore_physics_after = -1.0
 
+        self.descriptor: Optional[ParticleDescriptor] = None
+        # Parâmetros de origem (quando vem do editor/.otps), para reaproveitar o tipo
+        self.source_key = None
+        self.build_color_lut()
+
     @staticmethod
-    def random_range(min_val: float, max_val: float) -> float:
-        return random.uniform(min_val, max_val)
+    def random_range(min_val: float, max_val: float, rng: Optional[np.random.Generator] = None) -> float:
+        if rng is None:
+            return random.uniform(min_val, max_val)
+        return min_val + (max_val - min_val) * rng.random()
+
+    def get_descriptor(self) -> ParticleDescriptor:
+        # Reaproveita o descritor enquanto os atributos não mudarem, para que
+        # partículas do mesmo tipo apontem para o mesmo objeto
+        descriptor = ParticleDescriptor(
+            tuple(self.start_size),
+            tuple(self.final_size),
+            self.ignore_physics_after,
+            self.color_table,
+            self.texture,
+            self.shape,
+            self.composition_mode
+        )
+        if descriptor != self.descriptor:
+            self.descriptor = descriptor
+        return self.descriptor
 
     def get_name(self) -> str:
         return self.name
@@ -51,6 +90,25 @@ class ParticleType:
     def set_colors(self, colors: List[Tuple[int, int, int, int]], stops: List[float]):
         self.colors = colors
         self.colors_stops = stops
+        self.build_color_lut()
+
+    def build_color_lut(self):
+        # Degradê amostrado pela idade normalizada (0..1); as partículas do
+        # tipo compartilham a mesma tabela, só indexam por idade
+        lut = np.empty((COLOR_LUT_SIZE, 4), dtype=np.uint8)
+        if not self.colors:
+            lut[:] = (255, 255, 255, 255)
+        else:
+            colors = np.array(self.colors, dtype=float).reshape(-1, 4)
+            stops = list(self.colors_stops[:len(colors)])
+            stops += [1.0] * (len(colors) - len(stops))
+            life = np.linspace(0.0, 1.0, COLOR_LUT_SIZE)
+            for channel in range(4):
+                lut[:, channel] = np.interp(life, stops, colors[:, channel])
+
+        lut.flags.writeable = False
+        self.color_lut = lut
+        self.color_table = tuple(tuple(color) for color in lut.tolist())
 
     def set_texture(self, texture: pygame.Surface):
         self.texture = texture
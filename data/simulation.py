@@ -0,0 +1,57 @@
+import time
+from typing import Optional
+from otps_loader import load_otps_system
+from particle_system import STEP_SIZE
+
+
+def simulate_otps(filepath: str, seconds: float = 10.0, dt: float = STEP_SIZE,
+                  position: tuple = (0, 0), seed: Optional[int] = None,
+                  closed_form: bool = False) -> Optional[dict]:
+    """Simula um preset sem janela e devolve as estatísticas da execução"""
+    if not dt > 0:
+        raise ValueError(f"passo {dt} deve ser maior que zero")
+    particle_system = load_otps_system(filepath, position, seed=seed, closed_form=closed_form, step_size=dt)
+    if particle_system is None:
+        return None
+
+    steps = max(1, int(round(seconds / dt)))
+    peak_particles = 0
+    total_particles = 0
+    step_times = []
+
+    for i in range(steps):
+        start = time.perf_counter()
+        particle_system.step(dt)
+        step_times.append(time.perf_counter() - start)
+
+        count = particle_system.get_particle_count()
+        peak_particles = max(peak_particles, count)
+        total_particles += count
+
+    total_time = sum(step_times)
+    return {
+        'preset': filepath,
+        'seconds': steps * dt,
+        'dt': dt,
+        'seed': seed,
+        'steps': steps,
+        'peak_particles': peak_particles,
+        'average_particles': total_particles / steps,
+        'spawned_particles': particle_system.spawned_count,
+        'final_particles': particle_system.get_particle_count(),
+        'simulation_time': total_time,
+        'average_step_ms': total_time / steps * 1000.0,
+        'max_step_ms': max(step_times) * 1000.0,
+    }
+
+
+def format_simulation_stats(stats: dict) -> str:
+    return "\n".join([
+        f"Preset: {stats['preset']}",
+        f"  Passos: {stats['steps']} x {stats['dt']:.4f}s ({stats['seconds']:.2f}s simulados)",
+        f"  Partículas vivas (pico): {stats['peak_particles']}",
+        f"  Partículas vivas (média): {stats['average_particles']:.1f}",
+        f"  Partículas emitidas: {stats['spawned_particles']}",
+        f"  Tempo de simulação: {stats['simulation_time'] * 1000.0:.1f} ms",
+        f"  Tempo por passo: {stats['average_step_ms']:.3f} ms (máx {stats['max_step_ms']:.3f} ms)",
+    ])
@@ -0,0 +1,132 @@
+import math
+import numpy as np
+from typing import List
+from particle_pool import ParticlePool
+
+
+class SpawnRecords:
+    """Parâmetros de nascimento de cada partícula de um sistema sem affectors.
+    Aceleração constante e cor/tamanho pela idade: o estado em qualquer passo
+    sai em forma fechada, sem simular os passos intermediários"""
+
+    def __init__(self, capacity: int = 1024):
+        self.count = 0
+        self.capacity = 0
+        self.max_duration = 0.0
+        self.endless = False
+
+        self.spawn_step = np.zeros(0, dtype=np.int64)
+        self.origin = np.zeros((0, 2))
+        self.velocity = np.zeros((0, 2))
+        self.acceleration = np.zeros((0, 2))
+        self.start_size = np.zeros((0, 2))
+        self.final_size = np.zeros((0, 2))
+        self.duration = np.zeros(0)
+        self.ignore_physics_after = np.zeros(0)
+        self.look = np.zeros(0, dtype=np.int32)
+
+        self.reserve(capacity)
+
+    def _arrays(self) -> List[str]:
+        return ['spawn_step', 'origin', 'velocity', 'acceleration', 'start_size', 'final_size',
+                'duration', 'ignore_physics_after', 'look']
+
+    def reserve(self, capacity: int):
+        if capacity <= self.capacity:
+            return
+
+        for name in self._arrays():
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+
+        self.capacity = capacity
+
+    def clear(self):
+        self.count = 0
+        self.max_duration = 0.0
+        self.endless = False
+
+    def add(self, spawn_step: int, look: int, positions: np.ndarray, velocities: np.ndarray,
+            accelerations: np.ndarray, durations: np.ndarray, start_size: np.ndarray,
+            final_size: np.ndarray, ignore_physics_after: float):
+        count = len(durations)
+        if count == 0:
+            return
+
+        if self.count + count > self.capacity:
+            self.reserve(max(1024, self.capacity * 2, self.count + count))
+
+        block = slice(self.count, self.count + count)
+        self.spawn_step[block] = spawn_step
+        self.origin[block] = positions
+        self.velocity[block] = velocities
+        self.acceleration[block] = accelerations
+        self.start_size[block] = start_size
+        self.final_size[block] = final_size
+        self.duration[block] = durations
+        self.ignore_physics_after[block] = ignore_physics_after
+        self.look[block] = look
+        self.count += count
+
+        self.max_duration = max(self.max_duration, float(durations.max()))
+        self.endless = self.endless or bool((durations < 0).any())
+
+    def window_start(self, step: int, dt: float) -> int:
+        # Registros em ordem de nascimento: antes desta posição todos já morreram
+        if self.endless or self.count == 0:
+            return 0
+        oldest = step - int(math.ceil(self.max_duration / dt)) - 1
+        return int(np.searchsorted(self.spawn_step[:self.count], oldest, side='left'))
+
+    def evaluate(self, step: int, dt: float, pool: ParticlePool):
+        """Escreve no pool as partículas vivas ao fim do passo 'step'"""
+        window = slice(self.window_start(step, dt), self.count)
+
+        # k = updates recebidos; a partícula nasce e é atualizada no mesmo passo.
+        # Sai antes do update em que a idade já alcançou a duração
+        updates = step - self.spawn_step[window] + 1
+        duration = self.duration[window]
+        age = (updates - 1) * dt
+        alive = (updates >= 1) & ((duration < 0) | (age < duration))
+        index = np.flatnonzero(alive) + window.start
+
+        n = len(index)
+        pool.reserve(n)
+        pool.count = n
+        if n == 0:
+            return
+
+        updates = updates[alive]
+        age = age[alive]
+        duration = duration[alive]
+        ignore_after = self.ignore_physics_after[index]
+
+        # Passos com física: os de idade anterior < ignore-physics-after
+        physics = np.where(ignore_after < 0, updates,
+                           np.minimum(updates, np.ceil(np.maximum(ignore_after, 0) / dt)))
+        velocity = self.velocity[index]
+        acceleration = self.acceleration[index]
+        travel = velocity * (physics * dt)[:, None] \
+            + acceleration * (dt * dt * physics * (physics - 1) / 2)[:, None]
+
+        pool.position[:n, 0] = self.origin[index, 0] + travel[:, 0]
+        pool.position[:n, 1] = self.origin[index, 1] - travel[:, 1]
+        pool.velocity[:n] = velocity + acceleration * (physics * dt)[:, None]
+        pool.acceleration[:n] = acceleration
+        pool.start_size[:n] = self.start_size[index]
+        pool.final_size[:n] = self.final_size[index]
+        pool.elapsed_time[:n] = updates * dt
+        pool.duration[:n] = duration
+        pool.ignore_physics_after[:n] = ignore_after
+        pool.look[:n] = self.look[index]
+
+        # Cor e tamanho da idade antes do último update, como no passo a passo
+        timed = duration > 0
+        life = np.zeros(n)
+        np.divide(age, duration, out=life, where=timed)
+        start = pool.start_size[:n]
+        pool.size[:n] = np.where(timed[:, None], start + (pool.final_size[:n] - start) * life[:, None], start)
+        pool.color[:n] = pool.look_luts[pool.look[:n], 0]
+        pool.update_color(life, timed)
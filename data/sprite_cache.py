@@ -0,0 +1,183 @@
+from collections import OrderedDict
+from typing import Optional, Tuple
+import numpy as np
+import pygame
+
+
+# Faixa de tamanhos aceita pelo editor (adjust_parameter)
+MIN_STAMP_SIZE = 1
+MAX_STAMP_SIZE = 128
+
+SHAPE_CIRCLE = 0
+SHAPE_RECT = 1
+
+# composition-mode do .otps: 0=normal, 1=addition, 2=multiply
+COMPOSITION_NORMAL = 0
+COMPOSITION_ADDITION = 1
+COMPOSITION_MULTIPLY = 2
+
+# Degrau de cor das variantes no modo simplificado (menos variantes distintas)
+SIMPLE_COLOR_STEP = 32
+
+# Flags de blit por modo; as variantes de cada modo já vêm preparadas
+# (pré-multiplicadas pelo alfa) para que a soma/multiplicação respeite o alfa
+BLEND_FLAGS = {
+    COMPOSITION_NORMAL: 0,
+    COMPOSITION_ADDITION: pygame.BLEND_RGB_ADD,
+    COMPOSITION_MULTIPLY: pygame.BLEND_RGB_MULT,
+}
+
+
+class StampAtlas:
+    """Formas brancas pré-desenhadas; a cor entra depois, na variante do cache"""
+
+    def __init__(self, min_size: int = MIN_STAMP_SIZE, max_size: int = MAX_STAMP_SIZE):
+        self.circles = {}
+        self.rects = {}
+
+        for size in range(min_size, max_size + 1):
+            self.get_rect(size, size)
+            if size % 2 == 0:
+                self.get_circle(size // 2)
+
+    def get_circle(self, radius: int) -> pygame.Surface:
+        stamp = self.circles.get(radius)
+        if stamp is None:
+            stamp = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+            pygame.draw.circle(stamp, (255, 255, 255, 255), (radius, radius), radius)
+            self.circles[radius] = stamp
+        return stamp
+
+    def get_rect(self, width: int, height: int) -> pygame.Surface:
+        stamp = self.rects.get((width, height))
+        if stamp is None:
+            stamp = pygame.Surface((width, height), pygame.SRCALPHA)
+            stamp.fill((255, 255, 255, 255))
+            self.rects[(width, height)] = stamp
+        return stamp
+
+
+class SpriteCache:
+    """Cache LRU das variantes (tamanho, cor, alfa) das texturas de partícula"""
+
+    def __init__(self, max_entries: int = 1024, color_step: int = 8, size_step: int = 1):
+        self.max_entries = max_entries
+        self.color_step = color_step
+        self.size_step = size_step
+        self.entries: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.stamps: Optional[StampAtlas] = None
+
+    def quantize_size(self, size: Tuple[float, float]) -> Tuple[int, int]:
+        step = self.size_step
+        return (int(size[0]) // step * step, int(size[1]) // step * step)
+
+    def quantize_color(self, color: Tuple[int, int, int, int],
+                       step: Optional[int] = None) -> Tuple[int, int, int, int]:
+        # Arredonda para o degrau mais próximo, preservando 0 e 255; step só engrossa o degrau
+        step = self.color_step if step is None else max(self.color_step, step)
+        return tuple(min(255, (int(c) + step // 2) // step * step) for c in color)
+
+    def get_texture(self, texture: pygame.Surface, size: Tuple[float, float],
+                    color: Tuple[int, int, int, int],
+                    mode: int = COMPOSITION_NORMAL) -> Optional[pygame.Surface]:
+        width, height = self.quantize_size(size)
+        if width <= 0 or height <= 0:
+            return None
+        return self.get_variant(texture, width, height, self.quantize_color(color), mode)
+
+    def get_variant(self, base: pygame.Surface, width: int, height: int,
+                    color: Tuple[int, int, int, int], mode: int = COMPOSITION_NORMAL) -> pygame.Surface:
+        # Tamanho e cor já quantizados
+        key = (base, width, height, color, mode)
+        sprite = self.entries.get(key)
+        if sprite is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return sprite
+
+        self.misses += 1
+        if base.get_size() == (width, height):
+            sprite = base.copy()
+        else:
+            sprite = pygame.transform.scale(base, (width, height))
+        sprite = self.tint(sprite, color, mode)
+        self.entries[key] = sprite
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+        return sprite
+
+    def get_stamp(self, shape: int, size: Tuple[float, float]) -> Optional[pygame.Surface]:
+        if self.stamps is None:
+            self.stamps = StampAtlas()
+
+        if shape == SHAPE_CIRCLE:
+            radius = int(max(size[0], size[1]) / 2)
+            if radius <= 0:
+                return None
+            return self.stamps.get_circle(radius)
+
+        width, height = int(size[0]), int(size[1])
+        if width <= 0 or height <= 0:
+            return None
+        return self.stamps.get_rect(width, height)
+
+    def get_shape(self, shape: int, size: Tuple[float, float],
+                  color: Tuple[int, int, int, int],
+                  mode: int = COMPOSITION_NORMAL) -> Optional[pygame.Surface]:
+        stamp = self.get_stamp(shape, size)
+        if stamp is None:
+            return None
+        width, height = stamp.get_size()
+        return self.get_variant(stamp, width, height, self.quantize_color(color), mode)
+
+    @staticmethod
+    def tint(sprite: pygame.Surface, color: Tuple[int, int, int, int],
+             mode: int = COMPOSITION_NORMAL) -> pygame.Surface:
+        # Multiplica a textura pela cor do degradê, como o OTClient faz
+        per_pixel_alpha = sprite.get_flags() & pygame.SRCALPHA
+        if per_pixel_alpha:
+            sprite.fill(color, special_flags=pygame.BLEND_RGBA_MULT)
+        else:
+            sprite.fill(color[:3], special_flags=pygame.BLEND_RGB_MULT)
+            sprite.set_alpha(color[3])
+
+        if mode == COMPOSITION_NORMAL:
+            return sprite
+
+        if per_pixel_alpha:
+            alpha = pygame.surfarray.array_alpha(sprite)[..., None].astype(np.int32)
+        else:
+            alpha = color[3]
+
+        if mode == COMPOSITION_ADDITION:
+            # Soma: destino += cor * alfa
+            rgb = pygame.surfarray.pixels3d(sprite)
+            rgb[...] = (rgb * alpha + 127) // 255
+            del rgb
+        elif mode == COMPOSITION_MULTIPLY:
+            # Multiplicação: destino *= lerp(branco, cor, alfa)
+            rgb = pygame.surfarray.pixels3d(sprite)
+            rgb[...] = 255 - ((255 - rgb.astype(np.int32)) * alpha + 127) // 255
+            del rgb
+        return sprite
+
+    def clear(self):
+        self.entries.clear()
+
+    def get_stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self.entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+
+# Compartilhado entre sistemas: a mesma textura é reaproveitada ao recriar o efeito
+DEFAULT_SPRITE_CACHE = SpriteCache()
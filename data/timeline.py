@@ -0,0 +1,109 @@
+import sys
+import time
+from bisect import bisect_right
+from collections import OrderedDict
+from typing import Optional
+from particle_system import ParticleSystem
+
+# Um checkpoint a cada CHECKPOINT_INTERVAL segundos simulados
+CHECKPOINT_INTERVAL = 0.5
+MAX_CHECKPOINT_BYTES = 32 * 1024 * 1024
+
+
+def state_bytes(state: dict) -> int:
+    # Estimativa do que o checkpoint segura: arrays do pool ou objetos da lista
+    if 'pool' in state:
+        size = sum(array.nbytes for array in state['pool'].values())
+    elif 'particles' in state:
+        particles = state['particles']
+        size = sys.getsizeof(particles) + (sys.getsizeof(particles[0]) * len(particles) if particles else 0)
+    else:
+        size = 0
+    for _, emitter_state in state['emitters']:
+        size += sys.getsizeof(emitter_state) + sys.getsizeof(emitter_state['rng'])
+    return size + sys.getsizeof(state)
+
+
+class Timeline:
+    """Seek em qualquer instante de um efeito: checkpoints periódicos do estado
+    completo, com memória limitada, e ressimulação a partir do mais próximo"""
+
+    def __init__(
+        self,
+        particle_system: ParticleSystem,
+        step_size: Optional[float] = None,
+        checkpoint_interval: float = CHECKPOINT_INTERVAL,
+        max_bytes: int = MAX_CHECKPOINT_BYTES
+    ):
+        self.system = particle_system
+        self.step_size = step_size if step_size is not None else particle_system.step_size
+        self.interval = max(1, int(round(checkpoint_interval / self.step_size)))
+        self.max_bytes = max_bytes
+        self.step = 0
+
+        # Passo -> (estado, bytes), em ordem de uso; o passo 0 nunca sai
+        self.checkpoints: 'OrderedDict[int, tuple]' = OrderedDict()
+        self.checkpoint_bytes = 0
+        self.evicted = 0
+        self.last_seek_time = 0.0
+        self.last_resimulated = 0
+        self.save_checkpoint()
+
+    def get_time(self) -> float:
+        return self.step * self.step_size
+
+    def save_checkpoint(self):
+        state = self.system.get_state()
+        size = state_bytes(state)
+        if self.step and size > self.max_bytes:
+            return
+
+        self.checkpoints[self.step] = (state, size)
+        self.checkpoint_bytes += size
+        # Descarta os menos usados até caber no limite
+        for step in list(self.checkpoints):
+            if self.checkpoint_bytes <= self.max_bytes:
+                break
+            if step == 0 or step == self.step:
+                continue
+            self.checkpoint_bytes -= self.checkpoints.pop(step)[1]
+            self.evicted += 1
+
+    def seek(self, seconds: float) -> float:
+        start = time.perf_counter()
+        target = max(0, int(round(seconds / self.step_size)))
+
+        if self.system.records is not None:
+            # Forma fechada já posiciona em O(n), sem checkpoints
+            self.system.seek(target * self.step_size)
+            self.last_resimulated = 0
+        else:
+            steps = sorted(self.checkpoints)
+            nearest = steps[bisect_right(steps, target) - 1]
+            # Seguir do instante atual é mais barato se ele estiver entre o checkpoint e o alvo
+            if not nearest <= self.step <= target:
+                self.checkpoints.move_to_end(nearest)
+                self.system.set_state(self.checkpoints[nearest][0])
+                self.step = nearest
+
+            self.last_resimulated = target - self.step
+            while self.step < target:
+                self.system.step(self.step_size)
+                self.step += 1
+                if self.step % self.interval == 0 and self.step not in self.checkpoints:
+                    self.save_checkpoint()
+
+        self.step = target
+        self.last_seek_time = time.perf_counter() - start
+        return self.get_time()
+
+    def get_stats(self) -> dict:
+        return {
+            'time': self.get_time(),
+            'checkpoints': len(self.checkpoints),
+            'checkpoint_bytes': self.checkpoint_bytes,
+            'max_bytes': self.max_bytes,
+            'evicted': self.evicted,
+            'last_seek_ms': self.last_seek_time * 1000.0,
+            'last_resimulated': self.last_resimulated,
+        }
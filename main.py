@@ -6,6 +6,8 @@ from PyQt6.QtWidgets import QApplication, QFileDialog
 from PyQt6.QtCore import Qt
 import json
 import random
+import argparse
+import numpy as np
 
 
 if getattr(sys, 'frozen', False):
@@ -17,24 +19,49 @@ data_path = os.path.join(base_path, "data")
 if data_path not in sys.path:
     sys.path.append(data_path)
 
-from particle import Particle
-from particle_type import ParticleType
-from particle_emitter import ParticleEmitter
-from particle_system import ParticleSystem
-from particle_affector import GravityAffector, AttractionAffector
+from otps_loader import (
+    DEFAULT_PARTICLE_PARAMS, DEFAULT_EMITTER_PARAMS, DEFAULT_AFFECTOR_PARAMS,
+    DEFAULT_COLORS, DEFAULT_STOPS,
+    parse_otps_file, apply_otps_params, apply_otps_colors,
+    create_particle_system, update_particle_system
+)
+from particle_system import STEP_SIZE
+from simulation import simulate_otps, format_simulation_stats
+from baking import bake_otps
+from text_cache import TextCache
+from particle_budget import ParticleBudget, LEVEL_FULL
+from particle_scene import ParticleScene
+from timeline import Timeline
+from gc_monitor import GcMonitor
 
 pygame.init()
 
+# Acima desta fração da tela suja, um flip completo sai mais barato
+DIRTY_AREA_THRESHOLD = 0.5
+# Lado (px) dos blocos em que as partículas marcam a região suja
+DIRTY_TILE = 64
+
+# Largura do HUD no canto inferior direito: cabe a linha mais longa (orçamento/linha do tempo)
+HUD_WIDTH = 320
+
+# Orçamento do sistema de partículas no editor: a prévia degrada antes de travar
+EDITOR_MAX_PARTICLES = 20000
+EDITOR_FRAME_BUDGET = 0.012
+
+# Linha do tempo: tecla -> deslocamento em segundos (Home volta ao início)
+TIMELINE_KEYS = {
+    pygame.K_COMMA: -0.1,
+    pygame.K_PERIOD: 0.1,
+    pygame.K_LEFTBRACKET: -1.0,
+    pygame.K_RIGHTBRACKET: 1.0,
+    pygame.K_HOME: 0.0,
+}
+
 class ColorEditor:
 
     def __init__(self):
-        self.colors = [
-            [255, 255, 0, 255],
-            [255, 128, 0, 200],
-            [255, 0, 0, 100],
-            [50, 50, 50, 0]
-        ]
-        self.stops = [0.0, 0.3, 0.6, 1.0]
+        self.colors = [list(c) for c in DEFAULT_COLORS]
+        self.stops = list(DEFAULT_STOPS)
         self.selected_color = 0
         self.selected_channel = 0
 
@@ -65,6 +92,15 @@ class ParticleGenerator:
         self.clock = pygame.time.Clock()
         self.running = True
         self.particle_system = None
+        # Sistema limpo com C, guardado para o próximo reaproveitar os arrays
+        self.spare_system = None
+        # Pausas do coletor de lixo, para o HUD
+        self.gc_monitor = GcMonitor()
+        self.gc_monitor.install()
+        # Efeitos extras fixos na prévia (carga de uma tela cheia de criaturas)
+        self.scene = ParticleScene()
+        # Linha do tempo: efeito pausado num instante, com seek por checkpoints
+        self.timeline = None
         
         self.color_editor = ColorEditor()
         
@@ -81,68 +117,32 @@ class ParticleGenerator:
         self.effect_name = "custom_effect"
         
 
-        self.particle_params = {
-
-            'min_position_radius': 0.0,
-            'max_position_radius': 800.0,
-            'min_position_angle': 0.0,
-            'max_position_angle': 360.0,
-            
-            # Velocity
-            'min_velocity': 10.0,
-            'max_velocity': 150.0,
-            'min_velocity_angle': 30.0,
-            'max_velocity_angle': 50.0,
-            
-            # Acceleration
-            'min_acceleration': 0.0,
-            'max_acceleration': 20.0,
-            'min_acceleration_angle': 0.0,
-            'max_acceleration_angle': 360.0,
-            
-            # Duration
-            'min_duration': 0,
-            'max_duration': 3.5,
-            'ignore_physics_after': -1.0,
-            
-            # Size
-            'start_size': 8,
-            'final_size': 4,
-            'random_size_multiplier': 1.0,
-            
-            # Visual
-            'use_texture': False,
-            'composition_mode': 1,  # 0=normal, 1=additive, 2=multiply
-            'particle_shape': 0, 
-        }
+        self.particle_params = dict(DEFAULT_PARTICLE_PARAMS)
         
         # PARÂMETROS DO EMISSOR
-        self.emitter_params = {
-            'burst_rate': 25.0,
-            'burst_count': 1,
-            'duration': 10,
-            'delay': 0.1,
-        }
+        self.emitter_params = dict(DEFAULT_EMITTER_PARAMS)
         
-
-        self.affector_params = {
-
-            'use_gravity': False,
-            'gravity_angle': 180.0,
-            'gravity_strength': 100.0,
-            
-
-            'use_attraction': False,
-            'attraction_acceleration': 1000.0,
-            'attraction_reduction': 0.0,
-            'attraction_repelish': False,
-        }
+        self.affector_params = dict(DEFAULT_AFFECTOR_PARAMS)
         
         # Fontes
         self.font = pygame.font.Font(None, 22)
         self.small_font = pygame.font.Font(None, 18)
         self.title_font = pygame.font.Font(None, 28)
         
+        # Camadas: degradê fixo e painel redesenhado só quando algo muda
+        self.panel_width = 400
+        self.preview_rect = pygame.Rect(self.panel_width, 0, width - self.panel_width, height)
+        self.cache_layers = True
+        self.text_cache = TextCache()
+        self.background = self.build_background()
+        self.ui_layer = pygame.Surface((self.panel_width, height)).convert()
+        self.ui_dirty = True
+        
+        # Apresentação por retângulos sujos
+        self.hud_rect = pygame.Rect(width - HUD_WIDTH, height - 160, HUD_WIDTH, 160)
+        self.previous_rects = []
+        self.full_redraw = True
+        
         # Controles
         self.selected_param = 0
         self.param_lists = {
@@ -170,169 +170,17 @@ class ParticleGenerator:
                     self.particle_library.append(file)
         self.particle_library.sort()
 
-    def parse_otps_file(self, filepath):
-
-        try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-
-            params = {}
-            current_section = None
-
-            for line in lines:
-                line = line.strip()
-                if not line:
-                    continue
-
-                # Detectar seções
-                if line in ['Particle', 'Effect', 'System', 'Emitter', 'GravityAffector', 'AttractionAffector']:
-                    current_section = line
-                    continue
-
-                # Parse de parâmetros key: value
-                if ':' in line:
-                    key, value = line.split(':', 1)
-                    key = key.strip()
-                    value = value.strip()
-
-                    # Converter valores
-                    if current_section == 'Particle':
-                        if key == 'duration':
-                            params['max_duration'] = float(value)
-                        elif key == 'min-position-radius':
-                            params['min_position_radius'] = float(value)
-                        elif key == 'max-position-radius':
-                            params['max_position_radius'] = float(value)
-                        elif key == 'min-position-angle':
-                            params['min_position_angle'] = float(value)
-                        elif key == 'max-position-angle':
-                            params['max_position_angle'] = float(value)
-                        elif key == 'min-velocity':
-                            params['min_velocity'] = float(value)
-                        elif key == 'max-velocity':
-                            params['max_velocity'] = float(value)
-                        elif key == 'min-velocity-angle':
-                            params['min_velocity_angle'] = float(value)
-                        elif key == 'max-velocity-angle':
-                            params['max_velocity_angle'] = float(value)
-                        elif key == 'min-acceleration':
-                            params['min_acceleration'] = float(value)
-                        elif key == 'max-acceleration':
-                            params['max_acceleration'] = float(value)
-                        elif key == 'min-acceleration-angle':
-                            params['min_acceleration_angle'] = float(value)
-                        elif key == 'max-acceleration-angle':
-                            params['max_acceleration_angle'] = float(value)
-                        elif key == 'ignore-physics-after':
-                            params['ignore_physics_after'] = float(value)
-                        elif key == 'size':
-                            sizes = value.split()
-                            if len(sizes) >= 2:
-                                params['start_size'] = int(sizes[0])
-                                params['final_size'] = int(sizes[1])
-                        elif key == 'composition-mode':
-                            modes = {'normal': 0, 'addition': 1, 'multiply': 2}
-                            params['composition_mode'] = modes.get(value, 0)
-                        elif key == 'colors':
-                            colors = value.split()
-                            parsed_colors = []
-                            for c in colors:
-                                if c.startswith('#'):
-                                    r = int(c[1:3], 16)
-                                    g = int(c[3:5], 16)
-                                    b = int(c[5:7], 16)
-                                    a = int(c[7:9], 16) if len(c) > 7 else 255
-                                    parsed_colors.append([r, g, b, a])
-                            params['colors'] = parsed_colors
-                        elif key == 'colors-stops':
-                            stops = [float(s) for s in value.split()]
-                            params['color_stops'] = stops
-
-                    elif current_section == 'Emitter':
-                        if key == 'burst-rate':
-                            params['burst_rate'] = float(value)
-                        elif key == 'burst-count':
-                            params['burst_count'] = int(value)
-                        elif key == 'duration':
-                            params['emitter_duration'] = float(value)
-                        elif key == 'delay':
-                            params['delay'] = float(value)
-
-                    elif current_section == 'GravityAffector':
-                        params['use_gravity'] = True
-                        if key == 'angle':
-                            params['gravity_angle'] = float(value)
-                        elif key == 'gravity':
-                            params['gravity_strength'] = float(value)
-
-                    elif current_section == 'AttractionAffector':
-                        params['use_attraction'] = True
-                        if key == 'acceleration':
-                            params['attraction_acceleration'] = float(value)
-                        elif key == 'reduction':
-                            params['attraction_reduction'] = float(value)
-                        elif key == 'repelish':
-                            params['attraction_repelish'] = value.lower() == 'true'
-
-            return params
-
-        except Exception as e:
-            print(f"✗ Erro ao carregar preset: {e}")
-            return None
-
     def load_preset(self, filename):
         """Carrega um preset da biblioteca"""
         filepath = os.path.join(self.library_dir, filename)
-        params = self.parse_otps_file(filepath)
+        params = parse_otps_file(filepath)
 
         if not params:
             return False
 
-        # Aplicar parâmetros de partícula
-        for key in ['min_position_radius', 'max_position_radius', 'min_position_angle', 'max_position_angle',
-                    'min_velocity', 'max_velocity', 'min_velocity_angle', 'max_velocity_angle',
-                    'min_acceleration', 'max_acceleration', 'min_acceleration_angle', 'max_acceleration_angle',
-                    'max_duration', 'ignore_physics_after', 'start_size', 'final_size', 'composition_mode']:
-            if key in params:
-                self.particle_params[key] = params[key]
-
-        # Aplicar cores
-        if 'colors' in params and len(params['colors']) > 0:
-            self.color_editor.colors = params['colors'][:4]  # Máximo 4 cores
-            # Preencher com cores padrão se necessário
-            while len(self.color_editor.colors) < 4:
-                self.color_editor.colors.append([255, 255, 255, 255])
-
-        if 'color_stops' in params and len(params['color_stops']) > 0:
-            self.color_editor.stops = params['color_stops'][:4]
-            # Preencher stops
-            while len(self.color_editor.stops) < 4:
-                self.color_editor.stops.append(1.0)
-
-        # Aplicar parâmetros de emissor
-        for key in ['burst_rate', 'burst_count', 'delay']:
-            if key in params:
-                self.emitter_params[key] = params[key]
-
-        if 'emitter_duration' in params:
-            self.emitter_params['duration'] = params['emitter_duration']
-
-        # Aplicar affectors
-        if 'use_gravity' in params:
-            self.affector_params['use_gravity'] = params['use_gravity']
-            if 'gravity_angle' in params:
-                self.affector_params['gravity_angle'] = params['gravity_angle']
-            if 'gravity_strength' in params:
-                self.affector_params['gravity_strength'] = params['gravity_strength']
-
-        if 'use_attraction' in params:
-            self.affector_params['use_attraction'] = params['use_attraction']
-            if 'attraction_acceleration' in params:
-                self.affector_params['attraction_acceleration'] = params['attraction_acceleration']
-            if 'attraction_reduction' in params:
-                self.affector_params['attraction_reduction'] = params['attraction_reduction']
-            if 'attraction_repelish' in params:
-                self.affector_params['attraction_repelish'] = params['attraction_repelish']
+        apply_otps_params(params, self.particle_params, self.emitter_params, self.affector_params)
+        self.color_editor.colors, self.color_editor.stops = apply_otps_colors(
+            params, self.color_editor.colors, self.color_editor.stops)
 
         print(f"✓ Preset carregado: {filename}")
         return True
@@ -382,6 +230,7 @@ class ParticleGenerator:
             'burst_count': random.randint(1, 10),
             'duration': random.uniform(0, 10),
             'delay': random.uniform(0.05, 0.5),
+            'prewarm': self.emitter_params['prewarm'],  # Mantém prewarm
         }
         
         # Randomiza affectors
@@ -445,6 +294,7 @@ class ParticleGenerator:
                 self.texture_preview = pygame.transform.scale(self.texture, preview_size)
                 
                 self.particle_params['use_texture'] = True
+                self.apply_parameters()
                 
                 print(f"✓ Textura carregada: {self.texture_path}")
                 return True
@@ -547,6 +397,9 @@ Effect
       particle-type: {self.particle_name}
 """
 
+            if self.emitter_params['prewarm'] > 0:
+                content += f"      prewarm: {self.emitter_params['prewarm']:.2f}\n"
+
             # Gravity Affector
             if self.affector_params['use_gravity']:
                 content += f"""
@@ -578,95 +431,63 @@ Effect
             
             self.refresh_library()            
 
-    def create_particle_type(self) -> ParticleType:
-
-        ptype = ParticleType("custom")
-        
-        if self.particle_params['use_texture'] and self.texture:
-            ptype.set_texture(self.texture)
-        
-        ptype.set_colors(self.color_editor.get_colors(), self.color_editor.get_stops())
-        
-        # Position
-        ptype.set_position_radius(
-            self.particle_params['min_position_radius'],
-            self.particle_params['max_position_radius']
-        )
-        ptype.set_position_angle(
-            self.particle_params['min_position_angle'],
-            self.particle_params['max_position_angle']
-        )
-        
-        # Velocity
-        ptype.set_velocity(
-            self.particle_params['min_velocity'],
-            self.particle_params['max_velocity']
-        )
-        ptype.set_velocity_angle(
-            self.particle_params['min_velocity_angle'],
-            self.particle_params['max_velocity_angle']
-        )
-        
-        # Acceleration
-        ptype.set_acceleration(
-            self.particle_params['min_acceleration'],
-            self.particle_params['max_acceleration']
-        )
-        ptype.set_acceleration_angle(
-            self.particle_params['min_acceleration_angle'],
-            self.particle_params['max_acceleration_angle']
-        )
-        
-        # Duration
-        ptype.set_duration(
-            self.particle_params['min_duration'],
-            self.particle_params['max_duration']
-        )
-        ptype.ignore_physics_after = self.particle_params['ignore_physics_after']
-        
-        # Size
-        ptype.start_size = (self.particle_params['start_size'], self.particle_params['start_size'])
-        ptype.final_size = (self.particle_params['final_size'], self.particle_params['final_size'])
-        ptype.random_size_multiplier = (
-            self.particle_params['random_size_multiplier'],
-            self.particle_params['random_size_multiplier']
+    def build_particle_system(self, reuse=None):
+
+        particle_system = create_particle_system(
+            self.particle_params,
+            self.emitter_params,
+            self.affector_params,
+            self.color_editor.get_colors(),
+            self.color_editor.get_stops(),
+            self.mouse_pos,
+            self.texture,
+            reuse=reuse
         )
+        if particle_system.budget is None:
+            particle_system.budget = ParticleBudget(EDITOR_MAX_PARTICLES, EDITOR_FRAME_BUDGET)
+        return particle_system
+
+    def take_reusable_system(self):
 
-        ptype.shape = self.particle_params['particle_shape']       
-        return ptype
+        # O sistema atual (ou o guardado pelo C) é reiniciado no lugar
+        particle_system = self.particle_system or self.spare_system
+        self.spare_system = None
+        return particle_system
 
     def create_particle_system(self):
 
-        self.particle_system = ParticleSystem()
-        
-        emitter = ParticleEmitter()
-        emitter.set_position(self.mouse_pos)
-        emitter.set_burst_rate(self.emitter_params['burst_rate'])
-        emitter.set_burst_count(self.emitter_params['burst_count'])
-        emitter.set_duration(self.emitter_params['duration'])
-        emitter.set_delay(self.emitter_params['delay'])
-        
-        ptype = self.create_particle_type()
-        emitter.set_particle_type(ptype)
-        
-        self.particle_system.add_emitter(emitter)
-        
-        # Affectors
-        if self.affector_params['use_gravity']:
-            gravity = GravityAffector(
-                angle=self.affector_params['gravity_angle'],
-                gravity=self.affector_params['gravity_strength']
-            )
-            self.particle_system.add_affector(gravity)
-        
-        if self.affector_params['use_attraction']:
-            attraction = AttractionAffector(
-                position=self.mouse_pos,
-                acceleration=self.affector_params['attraction_acceleration'],
-                reduction=self.affector_params['attraction_reduction'],
-                repelish=self.affector_params['attraction_repelish']
-            )
-            self.particle_system.add_affector(attraction)
+        if self.timeline is not None:
+            # Mesmo instante com os parâmetros novos
+            self.start_timeline(self.timeline.get_time())
+            return
+        self.particle_system = self.build_particle_system(self.take_reusable_system())
+
+    def start_timeline(self, seconds):
+
+        # Sem orçamento: a degradação depende do tempo real e quebraria o seek
+        particle_system = self.build_particle_system(self.take_reusable_system())
+        particle_system.budget = None
+        self.timeline = Timeline(particle_system)
+        self.timeline.seek(seconds)
+        self.particle_system = particle_system
+
+    def toggle_timeline(self):
+
+        if self.timeline is None:
+            # O instante zero da linha do tempo já é o estado depois do prewarm
+            self.start_timeline(self.particle_system.elapsed_time - self.particle_system.prewarmed
+                                if self.particle_system else 0.0)
+            return
+
+        self.timeline = None
+        if self.particle_system:
+            # Continua a tocar do instante atual
+            self.particle_system.budget = ParticleBudget(EDITOR_MAX_PARTICLES, EDITOR_FRAME_BUDGET)
+            self.particle_system.last_update_time = self.particle_system.clock()
+
+    def scrub_timeline(self, delta):
+
+        self.timeline.seek(max(0.0, self.timeline.get_time() + delta))
 
     def handle_input(self):
 
@@ -686,7 +507,12 @@ Effect
             elif event.type == pygame.MOUSEMOTION:
                 self.mouse_pos = event.pos
                 
+            elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                self.full_redraw = True
+                
             elif event.type == pygame.KEYDOWN:
+                # Toda tecla pode mudar modo, seleção ou parâmetros
+                self.ui_dirty = True
                 if event.key == pygame.K_ESCAPE:
                     self.running = False
                     
@@ -702,7 +528,19 @@ Effect
                     
                 elif event.key == pygame.K_c:
                     if self.particle_system:
+                        self.spare_system = self.particle_system
                         self.particle_system = None
+                    self.timeline = None
+                    self.scene.clear()
+
+                elif event.key == pygame.K_p:
+                    self.toggle_timeline()
+
+                elif self.timeline is not None and event.key in TIMELINE_KEYS:
+                    if event.key == pygame.K_HOME:
+                        self.timeline.seek(0.0)
+                    else:
+                        self.scrub_timeline(TIMELINE_KEYS[event.key])
                 
                 elif event.key == pygame.K_t:
                     self.load_texture()
@@ -718,6 +556,10 @@ Effect
                     # Atualizar biblioteca
                     self.refresh_library()                    
                 
+                elif event.key == pygame.K_a and self.edit_mode != "colors":
+                    # Fixa uma cópia do efeito atual na posição do mouse
+                    self.scene.add_system(self.build_particle_system())
+                
                 # Navegação
                 elif self.edit_mode in ["particle", "emitter", "affectors"]:
                     if event.key == pygame.K_UP:
@@ -741,8 +583,10 @@ Effect
                         self.color_editor.next_color()
                     elif event.key == pygame.K_LEFT:
                         self.color_editor.adjust_channel(-5)
+                        self.apply_parameters()
                     elif event.key == pygame.K_RIGHT:
                         self.color_editor.adjust_channel(5)
+                        self.apply_parameters()
                     elif event.key == pygame.K_r:
                         self.color_editor.selected_channel = 0
                     elif event.key == pygame.K_g:
@@ -807,6 +651,9 @@ Effect
                 params[param_name] += direction * (10 * fine)
                 # Acceleration pode ser 0 ou negativa em alguns casos
                 params[param_name] = max(0.0, min(1000, params[param_name]))
+            elif 'prewarm' in param_name:
+                params[param_name] += direction * (0.5 * fine)
+                params[param_name] = max(0.0, min(30, params[param_name]))
             elif 'duration' in param_name or 'delay' in param_name:
                 params[param_name] += direction * (0.1 * fine)
                 # Duration pode ser 0.0 ou maior, mas delay precisa de mínimo
@@ -843,17 +690,73 @@ Effect
         elif param_name == 'particle_shape':
             params[param_name] = (params[param_name] + direction) % 2  # Alterna 0/1
 
+        self.apply_parameters()
+
+    def apply_parameters(self):
+
+        # Edição ao vivo: o sistema em execução recebe os parâmetros no próximo quadro.
+        # Na linha do tempo os checkpoints ficariam velhos, então recria no mesmo instante
+        if not self.particle_system:
+            return
+        if self.timeline is not None or not update_particle_system(
+                self.particle_system,
+                self.particle_params,
+                self.emitter_params,
+                self.affector_params,
+                self.color_editor.get_colors(),
+                self.color_editor.get_stops(),
+                self.texture):
+            self.create_particle_system()
+
+
+    def render_text(self, font, text, color):
+
+        if self.cache_layers:
+            return self.text_cache.render(font, text, color)
+        return font.render(text, True, color)
 
-    def render_ui(self):
+    def draw_background(self, surface):
 
-        panel_width = 400
-        pygame.draw.rect(self.screen, (20, 20, 30), (0, 0, panel_width, self.height))
+        for y in range(self.height):
+            color_val = int(5 + (y / self.height) * 15)
+            pygame.draw.line(surface, (color_val, color_val, color_val + 5),
+                           (self.panel_width, y), (self.width, y))
+
+    def build_background(self):
+
+        background = pygame.Surface((self.width, self.height)).convert()
+        background.fill((0, 0, 0))
+        self.draw_background(background)
+        return background
+
+    def render_ui(self, dirty_rects=None):
+
+        if self.ui_dirty or not self.cache_layers:
+            self.render_panel(self.ui_layer)
+            self.ui_dirty = False
+            dirty_rects = None
+
+        if dirty_rects is None:
+            self.screen.blit(self.ui_layer, (0, 0))
+        else:
+            # Só repõe o painel onde o fundo foi restaurado
+            panel_rect = self.ui_layer.get_rect()
+            for rect in dirty_rects:
+                area = rect.clip(panel_rect)
+                if area.width and area.height:
+                    self.screen.blit(self.ui_layer, area, area)
+        self.render_hud()
+
+    def render_panel(self, surface):
+
+        panel_width = self.panel_width
+        pygame.draw.rect(surface, (20, 20, 30), (0, 0, panel_width, self.height))
         
         y_offset = 10
         
         # Título
-        title = self.title_font.render("Editor de Partículas", True, (255, 255, 100))
-        self.screen.blit(title, (10, y_offset))
+        title = self.render_text(self.title_font, "Editor de Partículas", (255, 255, 100))
+        surface.blit(title, (10, y_offset))
         y_offset += 40
         
         # Modo atual
@@ -866,17 +769,17 @@ Effect
             
         }
         mode_color = (100, 255, 100)
-        mode_text = self.font.render(f"Modo: {mode_names[self.edit_mode]}", True, mode_color)
-        self.screen.blit(mode_text, (10, y_offset))
+        mode_text = self.render_text(self.font, f"Modo: {mode_names[self.edit_mode]}", mode_color)
+        surface.blit(mode_text, (10, y_offset))
         y_offset += 30
         
         # Renderiza conforme modo
         if self.edit_mode == "colors":
-            self.render_color_editor(y_offset, panel_width)
+            self.render_color_editor(surface, y_offset, panel_width)
         elif self.edit_mode == "library":  
-            self.render_library_ui(y_offset, panel_width)
+            self.render_library_ui(surface, y_offset, panel_width)
         else:                              
-            self.render_parameter_editor(y_offset, panel_width)
+            self.render_parameter_editor(surface, y_offset, panel_width)
 
         
         # Instruções gerais
@@ -890,22 +793,77 @@ Effect
             "L: Atualizar biblioteca",            
             "S: Salvar OTPS",
             "ESPAÇO: Testar",
+            "A: Adicionar à cena",
             "C: Limpar",
+            "P: Linha do tempo (, . [ ] Home)",
         ]
         
         y = self.height - len(instructions) * 18 - 10
         for inst in instructions:
-            text = self.small_font.render(inst, True, (100, 100, 100))
-            self.screen.blit(text, (10, y))
+            text = self.render_text(self.small_font, inst, (100, 100, 100))
+            surface.blit(text, (10, y))
             y += 18
-        
+
+    def render_hud(self):
+
+        if self.scene.systems:
+            scene_text = self.render_text(
+                self.small_font,
+                f"Cena: {len(self.scene.systems)} efeitos, {self.scene.get_particle_count()} partículas",
+                (100, 200, 255))
+            self.screen.blit(scene_text, (self.hud_rect.x, self.height - 120))
+
+        gc_stats = self.gc_monitor.get_stats()
+        gc_text = self.render_text(
+            self.small_font,
+            f"GC: {gc_stats['collections']} pausas (ger. 2: {gc_stats['by_generation'][2]}), "
+            f"máx {gc_stats['max_pause_ms']:.1f} ms",
+            (150, 150, 150))
+        self.screen.blit(gc_text, (self.hud_rect.x, self.height - 160))
+
+        if self.timeline is not None:
+            stats = self.timeline.get_stats()
+            timeline_text = self.render_text(
+                self.small_font,
+                f"Tempo: {stats['time']:.2f}s  {stats['checkpoints']} pontos "
+                f"{stats['checkpoint_bytes'] / 1048576:.1f}/{stats['max_bytes'] / 1048576:.0f} MB "
+                f"{stats['last_seek_ms']:.1f} ms",
+                (255, 220, 120))
+            self.screen.blit(timeline_text, (self.hud_rect.x, self.height - 140))
+
         # Contador de partículas
         if self.particle_system:
             count = self.particle_system.get_particle_count()
-            count_text = self.font.render(f"Partículas: {count}", True, (100, 255, 100))
-            self.screen.blit(count_text, (self.width - 180, self.height - 40))
-
-    def render_parameter_editor(self, y_offset, panel_width):
+            count_text = self.render_text(self.font, f"Partículas: {count}", (100, 255, 100))
+            self.screen.blit(count_text, (self.hud_rect.x, self.height - 40))
+
+            if self.particle_system.prewarmed:
+                prewarm_text = self.render_text(
+                    self.small_font,
+                    f"Prewarm: {self.particle_system.prewarmed:.2f}s em {self.particle_system.prewarm_time * 1000:.1f} ms",
+                    (100, 200, 100))
+                self.screen.blit(prewarm_text, (self.hud_rect.x, self.height - 20))
+
+            cache_stats = self.particle_system.sprite_cache.get_stats()
+            cache_text = self.render_text(
+                self.small_font, f"Sprites: {cache_stats['entries']} (acertos {cache_stats['hit_rate']:.0%})", (100, 200, 100))
+            self.screen.blit(cache_text, (self.hud_rect.x, self.height - 60))
+
+            cull_text = self.render_text(
+                self.small_font,
+                f"Desenhadas: {self.particle_system.drawn_count}  Cortadas: {self.particle_system.culled_count}",
+                (100, 200, 100))
+            self.screen.blit(cull_text, (self.hud_rect.x, self.height - 80))
+
+            budget = self.particle_system.budget
+            if budget is not None and (budget.level != LEVEL_FULL or budget.capped_particles):
+                stats = budget.get_stats()
+                avoided = stats['thinned_particles'] + stats['capped_particles']
+                budget_text = self.render_text(
+                    self.small_font, f"Orçamento: {stats['level_name']} (-{avoided} partículas)", (255, 180, 80))
+                self.screen.blit(budget_text, (self.hud_rect.x, self.height - 100))
+
+    def render_parameter_editor(self, surface, y_offset, panel_width):
 
         params = self.get_current_params()
         param_list = self.get_current_param_list()
@@ -933,54 +891,54 @@ Effect
             if len(display_name) > 25:
                 display_name = display_name[:22] + "..."
             
-            text = self.small_font.render(f"{display_name}: {value_str}", True, color)
-            self.screen.blit(text, (10, y_offset))
+            text = self.render_text(self.small_font, f"{display_name}: {value_str}", color)
+            surface.blit(text, (10, y_offset))
             y_offset += 20
 
-    def render_color_editor(self, y_offset, panel_width):
+    def render_color_editor(self, surface, y_offset, panel_width):
 
-        colors_title = self.font.render("Editor de Cores:", True, (255, 255, 255))
-        self.screen.blit(colors_title, (10, y_offset))
+        colors_title = self.render_text(self.font, "Editor de Cores:", (255, 255, 255))
+        surface.blit(colors_title, (10, y_offset))
         y_offset += 25
         
         channels = ['R', 'G', 'B', 'A']
         for i, color in enumerate(self.color_editor.colors):
             if i == self.color_editor.selected_color:
-                pygame.draw.rect(self.screen, (255, 255, 255), 
+                pygame.draw.rect(surface, (255, 255, 255), 
                                (5, y_offset - 2, panel_width - 10, 54), 2)
             
-            color_name = self.small_font.render(f"Cor {i+1}:", True, (200, 200, 200))
-            self.screen.blit(color_name, (10, y_offset))
+            color_name = self.render_text(self.small_font, f"Cor {i+1}:", (200, 200, 200))
+            surface.blit(color_name, (10, y_offset))
             y_offset += 18
             
             preview_rect = pygame.Rect(10, y_offset, 80, 30)
-            pygame.draw.rect(self.screen, tuple(color), preview_rect)
-            pygame.draw.rect(self.screen, (100, 100, 100), preview_rect, 1)
+            pygame.draw.rect(surface, tuple(color), preview_rect)
+            pygame.draw.rect(surface, (100, 100, 100), preview_rect, 1)
             
             for j, (ch, val) in enumerate(zip(channels, color)):
                 ch_color = (255, 255, 0) if (i == self.color_editor.selected_color and 
                                               j == self.color_editor.selected_channel) else (150, 150, 150)
-                ch_text = self.small_font.render(f"{ch}:{val:3d}", True, ch_color)
-                self.screen.blit(ch_text, (100 + j * 70, y_offset + 8))
+                ch_text = self.render_text(self.small_font, f"{ch}:{val:3d}", ch_color)
+                surface.blit(ch_text, (100 + j * 70, y_offset + 8))
             
             y_offset += 40
             
             
-    def render_library_ui(self, y_offset, panel_width):
+    def render_library_ui(self, surface, y_offset, panel_width):
 
-        lib_title = self.font.render("Biblioteca de Presets:", True, (255, 255, 255))
-        self.screen.blit(lib_title, (10, y_offset))
+        lib_title = self.render_text(self.font, "Biblioteca de Presets:", (255, 255, 255))
+        surface.blit(lib_title, (10, y_offset))
         y_offset += 30
 
         if len(self.particle_library) == 0:
-            empty_text = self.small_font.render("Nenhum preset encontrado", True, (150, 150, 150))
-            self.screen.blit(empty_text, (10, y_offset))
+            empty_text = self.render_text(self.small_font, "Nenhum preset encontrado", (150, 150, 150))
+            surface.blit(empty_text, (10, y_offset))
             y_offset += 20
-            help_text = self.small_font.render("Salve com 'S' para criar presets", True, (100, 100, 100))
-            self.screen.blit(help_text, (10, y_offset))
+            help_text = self.render_text(self.small_font, "Salve com 'S' para criar presets", (100, 100, 100))
+            surface.blit(help_text, (10, y_offset))
         else:
-            info_text = self.small_font.render(f"Total: {len(self.particle_library)} presets", True, (100, 200, 100))
-            self.screen.blit(info_text, (10, y_offset))
+            info_text = self.render_text(self.small_font, f"Total: {len(self.particle_library)} presets", (100, 200, 100))
+            surface.blit(info_text, (10, y_offset))
             y_offset += 25
 
             # Lista de presets
@@ -1002,14 +960,14 @@ Effect
                     color = (255, 255, 0)
                     marker = "► "
                     # Desenhar fundo de seleção
-                    pygame.draw.rect(self.screen, (40, 40, 60), 
+                    pygame.draw.rect(surface, (40, 40, 60), 
                                    (5, y_offset - 2, panel_width - 10, 18))
                 else:
                     color = (180, 180, 180)
                     marker = "  "
 
-                text = self.small_font.render(f"{marker}{display_name}", True, color)
-                self.screen.blit(text, (10, y_offset))
+                text = self.render_text(self.small_font, f"{marker}{display_name}", color)
+                surface.blit(text, (10, y_offset))
                 y_offset += 18
 
             # Instruções específicas da biblioteca
@@ -1025,40 +983,230 @@ Effect
 
             for inst in lib_instructions:
                 if inst:
-                    text = self.small_font.render(inst, True, (150, 150, 200))
-                    self.screen.blit(text, (10, y_offset))
+                    text = self.render_text(self.small_font, inst, (150, 150, 200))
+                    surface.blit(text, (10, y_offset))
                 y_offset += 18            
 
+    def extents_to_rects(self, extents):
+
+        # Blocos de DIRTY_TILE px tocados pelas partículas, juntados em faixas
+        # por linha: um efeito espalhado suja só onde há partículas, não a
+        # caixa que envolve todas. Margem de 2 px para o arredondamento dos blits
+        columns = -(-self.width // DIRTY_TILE)
+        rows = -(-self.height // DIRTY_TILE)
+        left = np.floor(extents[:, 0]) - 2
+        top = np.floor(extents[:, 1]) - 2
+        right = np.ceil(extents[:, 2]) + 2
+        bottom = np.ceil(extents[:, 3]) + 2
+        onscreen = (right > 0) & (left < self.width) & (bottom > 0) & (top < self.height)
+        if not onscreen.any():
+            return []
+
+        x0 = np.clip(left[onscreen] // DIRTY_TILE, 0, columns - 1).astype(np.intp)
+        y0 = np.clip(top[onscreen] // DIRTY_TILE, 0, rows - 1).astype(np.intp)
+        x1 = np.clip((right[onscreen] - 1) // DIRTY_TILE, 0, columns - 1).astype(np.intp) + 1
+        y1 = np.clip((bottom[onscreen] - 1) // DIRTY_TILE, 0, rows - 1).astype(np.intp) + 1
+
+        # Cada caixa marca seus blocos por diferenças nos cantos + soma acumulada
+        marks = np.zeros((rows + 1, columns + 1), dtype=np.int32)
+        np.add.at(marks, (y0, x0), 1)
+        np.add.at(marks, (y0, x1), -1)
+        np.add.at(marks, (y1, x0), -1)
+        np.add.at(marks, (y1, x1), 1)
+        covered = marks.cumsum(axis=0).cumsum(axis=1)[:rows, :columns] > 0
+
+        screen_rect = self.screen.get_rect()
+        rects = []
+        for row in np.flatnonzero(covered.any(axis=1)).tolist():
+            edges = np.flatnonzero(np.diff(np.r_[0, covered[row].astype(np.int8), 0])).tolist()
+            for start, end in zip(edges[::2], edges[1::2]):
+                rect = pygame.Rect(start * DIRTY_TILE, row * DIRTY_TILE,
+                                   (end - start) * DIRTY_TILE, DIRTY_TILE)
+                rects.append(rect.clip(screen_rect))
+        return rects
+
+    def get_frame_rects(self):
+
+        # Regiões desenhadas neste quadro: partículas, HUD e cursor
+        rects = []
+        for source in (self.particle_system, self.scene):
+            if source is not None:
+                rects.extend(self.extents_to_rects(source.get_extents()))
+        # O contador do GC fica sempre no HUD
+        rects.append(self.hud_rect)
+
+        x, y = self.mouse_pos
+        rects.append(pygame.Rect(x - 8, y - 8, 17, 17))
+        return rects
+
+    def render_frame(self):
+
+        if self.particle_system and self.timeline is None:
+            self.particle_system.update()
+        if self.scene.systems:
+            self.scene.update()
+
+        # Sujo = o que foi desenhado no quadro anterior + o que será desenhado agora
+        frame_rects = self.get_frame_rects()
+        dirty_rects = self.previous_rects + frame_rects
+        if self.ui_dirty:
+            dirty_rects.append(self.ui_layer.get_rect())
+        self.previous_rects = frame_rects
+
+        dirty_area = sum(rect.width * rect.height for rect in dirty_rects)
+        full = (not self.cache_layers or self.full_redraw
+                or dirty_area > DIRTY_AREA_THRESHOLD * self.width * self.height)
+        self.full_redraw = False
+
+        # Fundo com degradê
+        if not self.cache_layers:
+            self.draw_background(self.screen)
+        elif full:
+            self.screen.blit(self.background, (0, 0))
+        else:
+            for rect in dirty_rects:
+                self.screen.blit(self.background, rect, rect)
+        
+        # Sistema de partículas
+        if self.scene.systems:
+            self.scene.render(self.screen, self.preview_rect)
+        if self.particle_system:
+            self.particle_system.render(self.screen, self.preview_rect)
+            if self.particle_system.budget is not None:
+                for message in self.particle_system.budget.take_reports():
+                    print(f"⚠ Orçamento: {message}")
+        
+        # UI
+        self.render_ui(None if full else dirty_rects)
+        
+        # Cursor
+        pygame.draw.circle(self.screen, (255, 0, 0), self.mouse_pos, 5, 2)
+        pygame.draw.circle(self.screen, (255, 255, 255), self.mouse_pos, 7, 1)
+
+        # None pede um flip completo
+        return None if full else dirty_rects
+
+    def present(self, dirty_rects):
+
+        if dirty_rects is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(dirty_rects)
+
     def run(self):
 
         while self.running:
             self.handle_input()
-            
-            # Fundo com degradê
-            for y in range(self.height):
-                color_val = int(5 + (y / self.height) * 15)
-                pygame.draw.line(self.screen, (color_val, color_val, color_val + 5),
-                               (400, y), (self.width, y))
-            
-            # Sistema de partículas
-            if self.particle_system:
-                self.particle_system.update()
-                self.particle_system.render(self.screen)
-            
-            # UI
-            self.render_ui()
-            
-            # Cursor
-            pygame.draw.circle(self.screen, (255, 0, 0), self.mouse_pos, 5, 2)
-            pygame.draw.circle(self.screen, (255, 255, 255), self.mouse_pos, 7, 1)
-            
-            pygame.display.flip()
+            self.present(self.render_frame())
             self.clock.tick(60)
         
+        self.scene.close()
+        self.gc_monitor.uninstall()
         pygame.quit()
         sys.exit()
 
 
-if __name__ == "__main__":
+def run_simulate(args):
+
+    stats = simulate_otps(args.preset, args.seconds, args.dt, seed=args.seed, closed_form=args.closed_form)
+    if stats is None:
+        print(f"✗ Não foi possível simular: {args.preset}")
+        return 1
+
+    print(format_simulation_stats(stats))
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(stats, f, indent=2)
+        print(f"✓ Estatísticas salvas: {args.json}")
+    return 0
+
+
+def positive_float(text):
+    """Número maior que zero (tempo e passo da simulação)"""
+    try:
+        value = float(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"número inválido '{text}'")
+    if not value > 0:
+        raise argparse.ArgumentTypeError(f"'{text}' deve ser maior que zero")
+    return value
+
+
+def parse_color(text):
+    """Converte RRGGBB ou RRGGBBAA em (r, g, b, a); sem alfa o fundo é opaco"""
+    digits = text.lstrip('#')
+    if len(digits) not in (6, 8):
+        raise argparse.ArgumentTypeError(f"cor inválida '{text}': use RRGGBB ou RRGGBBAA")
+    try:
+        color = tuple(int(digits[i:i + 2], 16) for i in range(0, len(digits), 2))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"cor inválida '{text}': use dígitos hexadecimais")
+    return color if len(color) == 4 else color + (255,)
+
+
+def run_bake(args):
+
+    result = bake_otps(args.preset, args.output, args.frames, args.dt, tuple(args.size),
+                       sheet=args.sheet, columns=args.columns, rows=args.rows,
+                       background=args.background, seed=args.seed, workers=args.workers)
+    if result is None:
+        print(f"✗ Não foi possível renderizar: {args.preset}")
+        return 1
+
+    print(f"✓ {result['frames']} quadros em {len(result['files'])} arquivos: {args.output}")
+    print(f"  Tempo total: {result['bake_time'] * 1000.0:.1f} ms "
+          f"(espera pela codificação: {result['encode_wait'] * 1000.0:.1f} ms)")
+    if result['blank_frames'] == result['frames']:
+        print("✗ Todos os quadros saíram vazios (só o fundo)")
+        return 1
+    if result['blank_frames']:
+        print(f"  ⚠ {result['blank_frames']} quadros vazios (só o fundo)")
+    return 0
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description="Editor de Partículas para OTClient")
+    subparsers = parser.add_subparsers(dest="command")
+
+    # Modo sem janela: simula um preset e mostra as estatísticas
+    simulate = subparsers.add_parser("simulate", help="Simula um preset .otps sem abrir janela")
+    simulate.add_argument("preset", help="Arquivo .otps")
+    simulate.add_argument("--seconds", type=positive_float, default=10.0, help="Tempo simulado em segundos")
+    simulate.add_argument("--dt", type=positive_float, default=STEP_SIZE, help="Passo fixo da simulação")
+    simulate.add_argument("--seed", type=int, help="Semente para repetir a simulação exatamente")
+    simulate.add_argument("--json", metavar="ARQUIVO", help="Grava as estatísticas em JSON")
+    simulate.add_argument("--closed-form", action="store_true",
+                          help="Avalia em forma fechada quando o preset não tem affectors")
+
+    # Quadros pré-renderizados para clientes sem simulação ao vivo
+    bake = subparsers.add_parser("bake", help="Renderiza um preset .otps em PNGs ou folha de sprites")
+    bake.add_argument("preset", help="Arquivo .otps")
+    bake.add_argument("--output", default="baked", help="Pasta de saída")
+    bake.add_argument("--frames", type=int, default=60, help="Número de quadros")
+    bake.add_argument("--dt", type=positive_float, default=STEP_SIZE, help="Passo fixo entre quadros")
+    bake.add_argument("--size", type=int, nargs=2, default=[256, 256], metavar=("L", "A"),
+                      help="Tamanho de cada quadro; o efeito fica no centro")
+    bake.add_argument("--sheet", action="store_true", help="Agrupa os quadros em folhas de sprites")
+    bake.add_argument("--columns", type=int, default=8, help="Colunas por folha")
+    bake.add_argument("--rows", type=int, default=8, help="Linhas por folha")
+    bake.add_argument("--background", type=parse_color, default=(0, 0, 0, 0), metavar="RRGGBB[AA]",
+                      help="Fundo dos quadros (efeitos aditivos pedem fundo opaco)")
+    bake.add_argument("--seed", type=int, help="Semente para repetir a renderização exatamente")
+    bake.add_argument("--workers", type=int, help="Processos de codificação PNG (0 = no processo atual)")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "simulate":
+        return run_simulate(args)
+    if args.command == "bake":
+        return run_bake(args)
+
     generator = ParticleGenerator()
     generator.run()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
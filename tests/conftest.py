@@ -0,0 +1,26 @@
+import os
+import sys
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA = os.path.join(ROOT, 'data')
+if DATA not in sys.path:
+    sys.path.append(DATA)
+
+import pygame
+import pytest
+
+PRESETS = os.path.join(ROOT, 'presets')
+
+
+@pytest.fixture(scope='session', autouse=True)
+def pygame_display():
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    yield
+    pygame.quit()
+
+
+def preset_path(name: str) -> str:
+    return os.path.join(PRESETS, name)
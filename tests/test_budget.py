@@ -0,0 +1,26 @@
+import pygame
+import pytest
+from conftest import preset_path
+from otps_loader import load_otps_system
+from particle_budget import ParticleBudget, LEVEL_SIMPLE_STAMPS
+
+
+@pytest.mark.parametrize('use_pool', [False, True])
+def test_simple_stamps_level_applies_in_both_modes(use_pool):
+    particle_system = load_otps_system(preset_path('creature-particles.otps'), (200, 200),
+                                       use_pool=use_pool, seed=0)
+    particle_system.renderer.splat_threshold = 0
+    for _ in range(30):
+        particle_system.step(1 / 60)
+
+    surfaces = []
+    for level in (0, LEVEL_SIMPLE_STAMPS):
+        particle_system.budget = ParticleBudget(frame_budget=1.0)
+        particle_system.budget.level = level
+        surface = pygame.Surface((400, 400))
+        particle_system.render(surface)
+        surfaces.append(pygame.image.tostring(surface, 'RGB'))
+
+    assert particle_system.budget.simplified_renders == 1
+    # Textura trocada pelo stamp da forma: o quadro muda
+    assert surfaces[0] != surfaces[1]
@@ -0,0 +1,55 @@
+import pytest
+from otps_loader import (
+    DEFAULT_PARTICLE_PARAMS, DEFAULT_COLORS, DEFAULT_STOPS, create_particle_type
+)
+from particle_emitter import ParticleEmitter
+
+DT = 0.05
+
+
+class BurstCounter:
+    # Só conta o que o emissor pediria ao ParticleSystem
+    def __init__(self):
+        self.spawned = 0
+
+    def add_particles(self, particle_type, positions, velocities, accelerations, durations, multipliers):
+        self.spawned += len(durations)
+
+
+@pytest.fixture
+def emitter():
+    emitter = ParticleEmitter(seed=0)
+    emitter.set_particle_type(create_particle_type(DEFAULT_PARTICLE_PARAMS, DEFAULT_COLORS, DEFAULT_STOPS))
+    emitter.set_burst_rate(10)
+    emitter.set_burst_count(1)
+    return emitter
+
+
+def run(emitter, seconds):
+    counter = BurstCounter()
+    for _ in range(int(round(seconds / DT))):
+        emitter.update(DT, counter)
+    return counter.spawned
+
+
+def test_raised_delay_pauses_active_emitter(emitter):
+    run(emitter, 1.0)
+    assert emitter.active
+
+    # Novo atraso 1 s à frente: nada sai até ele passar, depois o ritmo normal
+    emitter.set_delay(emitter.elapsed_time + 1.0)
+    assert emitter.current_burst == 0
+    assert run(emitter, 0.95) == 0
+    assert run(emitter, 1.0) == pytest.approx(10, abs=1)
+
+
+def test_lowered_delay_does_not_replay_missed_bursts(emitter):
+    emitter.set_delay(5.0)
+    run(emitter, 3.0)
+    assert not emitter.active
+
+    # Atraso agora 3 s no passado: segue no ritmo daqui, sem os ~30 bursts perdidos
+    emitter.set_delay(0.0)
+    assert emitter.active
+    assert run(emitter, DT) <= 1
+    assert run(emitter, 1.0) == pytest.approx(10, abs=1)
@@ -0,0 +1,36 @@
+import pytest
+from conftest import preset_path
+from otps_loader import load_otps_system
+from particle_system import STEP_SIZE
+
+DT = 0.01
+
+
+@pytest.fixture
+def prewarmed_preset(tmp_path):
+    # Preset sem affectors (forma fechada possível) com prewarm no emissor
+    with open(preset_path('creature-particles.otps'), encoding='utf-8') as f:
+        text = f.read()
+    text = text.replace('    Emitter\n', '    Emitter\n      prewarm: 2.0\n', 1)
+    path = tmp_path / 'prewarm.otps'
+    path.write_text(text, encoding='utf-8')
+    return str(path)
+
+
+def test_closed_form_prewarm_uses_caller_dt(prewarmed_preset):
+    particle_system = load_otps_system(prewarmed_preset, seed=0, closed_form=True, step_size=DT)
+    assert particle_system.records is not None
+    assert particle_system.prewarmed == pytest.approx(2.0)
+    for _ in range(50):
+        particle_system.step(DT)
+    assert particle_system.elapsed_time == pytest.approx(2.5)
+
+
+def test_closed_form_prewarm_matches_stepped(prewarmed_preset):
+    closed = load_otps_system(prewarmed_preset, seed=0, closed_form=True, step_size=DT)
+    stepped = load_otps_system(prewarmed_preset, seed=0, step_size=DT)
+    assert closed.step_size == stepped.step_size == DT != STEP_SIZE
+    for _ in range(50):
+        closed.step(DT)
+        stepped.step(DT)
+        assert closed.get_particle_count() == stepped.get_particle_count()
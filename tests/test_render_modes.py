@@ -0,0 +1,40 @@
+import os
+import numpy as np
+import pygame
+import pytest
+from conftest import PRESETS, preset_path
+from otps_loader import load_otps_system
+
+STEPS = 90
+SIZE = (800, 600)
+
+
+def render(particle_system) -> np.ndarray:
+    surface = pygame.Surface(SIZE)
+    surface.fill((0, 0, 0))
+    particle_system.render(surface)
+    return pygame.surfarray.array3d(surface)
+
+
+@pytest.mark.parametrize('preset', sorted(os.listdir(PRESETS)))
+def test_list_and_pool_render_the_same_pixels(preset):
+    position = (SIZE[0] // 2, SIZE[1] // 2)
+    listed = load_otps_system(preset_path(preset), position, use_pool=False, seed=0)
+    pooled = load_otps_system(preset_path(preset), position, use_pool=True, seed=0)
+    # Splat compõe em float e arredonda diferente do blit; aqui só o caminho de sprites
+    pooled.renderer.splat_threshold = 0
+    for _ in range(STEPS):
+        listed.step(1 / 60)
+        pooled.step(1 / 60)
+
+    # O pool reaproveita vagas trocando com o fim, então a ordem de desenho difere;
+    # a lista é posta na ordem do pool para comparar só tamanho, cor e posição
+    pool = pooled.pool
+    assert len(listed.particles) == pool.count
+    positions = np.array([particle.get_position() for particle in listed.particles]).reshape(-1, 2)
+    order = np.lexsort(positions.T)
+    rank = np.empty(pool.count, dtype=np.intp)
+    rank[np.lexsort(pool.position[:pool.count].T)] = np.arange(pool.count)
+    listed.particles = [listed.particles[i] for i in order[rank]]
+
+    assert np.array_equal(render(listed), render(pooled))